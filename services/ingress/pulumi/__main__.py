@@ -2,7 +2,9 @@ import pulumi as p
 import pulumi_cloudflare as cloudflare
 import pulumi_kubernetes as k8s
 
+from ingress.cache import create_cache_rules
 from ingress.cloudflared import create_cloudflared
+from ingress.hostnames import create_tunnel_dns_records, get_zone
 from ingress.model import ComponentConfig
 
 component_config = ComponentConfig.model_validate(p.Config().get_object('config'))
@@ -16,4 +18,12 @@ k8s_stack = p.StackReference(f'{p.get_organization()}/kubernetes/{p.get_stack()}
 kube_config = k8s_stack.get_output('kube-config')
 k8s_provider = k8s.Provider('k8s', kubeconfig=kube_config)
 
-create_cloudflared(component_config, k8s_provider, cloudflare_provider)
+# resolve zone and account once for tunnel, DNS records and cache rules:
+zone_name = component_config.cloudflare.zone
+zone = get_zone(zone_name, cloudflare_provider)
+
+tunnel = create_cloudflared(component_config, zone.account.id, k8s_provider, cloudflare_provider)
+create_tunnel_dns_records(
+    component_config.cloudflared.ingress, zone_name, zone.zone_id, tunnel.id, cloudflare_provider
+)
+create_cache_rules(component_config.cloudflared.ingress, zone.zone_id, cloudflare_provider)
@@ -0,0 +1,68 @@
+"""Cloudflare edge cache rules for the tunneled hostnames."""
+
+import json
+
+import pulumi as p
+import pulumi_cloudflare as cloudflare
+
+from ingress.model import CloudflareCacheConfig, CloudflareTunnelIngressConfig
+
+
+def create_cache_rules(
+    ingresses: list[CloudflareTunnelIngressConfig],
+    zone_id: p.Input[str],
+    cloudflare_provider: cloudflare.Provider,
+) -> cloudflare.Ruleset | None:
+    rules = [
+        get_cache_rule(ingress.hostname, ingress.cache) for ingress in ingresses if ingress.cache
+    ]
+    if not rules:
+        return None
+
+    # a zone has a single entry point ruleset per phase, so all rules go into one ruleset:
+    return cloudflare.Ruleset(
+        'cache-rules',
+        zone_id=zone_id,
+        name='default',
+        description='Edge cache rules for cloudflared ingresses',
+        kind='zone',
+        phase='http_request_cache_settings',
+        rules=rules,
+        opts=p.ResourceOptions(provider=cloudflare_provider),
+    )
+
+
+def get_cache_rule(hostname: str, config: CloudflareCacheConfig) -> cloudflare.RulesetRuleArgsDict:
+    browser_ttl: cloudflare.RulesetRuleActionParametersBrowserTtlArgsDict = (
+        {'mode': 'override_origin', 'default': config.browser_ttl_sec}
+        if config.browser_ttl_sec
+        else {'mode': 'respect_origin'}
+    )
+    return {
+        'description': f'Cache static assets of {hostname}',
+        'expression': get_cache_expression(hostname, config),
+        'action': 'set_cache_settings',
+        'action_parameters': {
+            'cache': True,
+            'edge_ttl': {'mode': 'override_origin', 'default': config.edge_ttl_sec},
+            'browser_ttl': browser_ttl,
+        },
+        'enabled': True,
+    }
+
+
+def get_cache_expression(hostname: str, config: CloudflareCacheConfig) -> str:
+    """Rules language expression matching the cacheable requests of a hostname."""
+    filters = [
+        f'starts_with(http.request.uri.path, {_quote(prefix)})' for prefix in config.path_prefixes
+    ]
+    if config.extensions:
+        extensions = ' '.join(_quote(extension.lstrip('.')) for extension in config.extensions)
+        filters.append(f'http.request.uri.path.extension in {{{extensions}}}')
+
+    return f'(http.host eq {_quote(hostname)} and ({" or ".join(filters)}))'
+
+
+def _quote(value: str) -> str:
+    # string literals of the rules language use the JSON escaping rules:
+    return json.dumps(value)
@@ -1,18 +1,20 @@
 import base64
+import typing as t
 
 import pulumi as p
 import pulumi_cloudflare as cloudflare
 import pulumi_kubernetes as k8s
 import pulumi_random
 
-from ingress.model import ComponentConfig
+from ingress.model import CloudflareOriginRequestConfig, ComponentConfig
 
 
 def create_cloudflared(
     component_config: ComponentConfig,
+    account_id: p.Input[str],
     k8s_provider: k8s.Provider,
     cloudflare_provider: cloudflare.Provider,
-):
+) -> cloudflare.ZeroTrustTunnelCloudflared:
     ns = k8s.core.v1.Namespace(
         'cloudflared',
         metadata={'name': 'cloudflared'},
@@ -30,12 +32,10 @@ def create_cloudflared(
     cloudflare_invoke_opts = p.InvokeOptions(provider=cloudflare_provider)
 
     # create cloudflared tunnel:
-    cloudflare_accounts = cloudflare.get_accounts_output(opts=cloudflare_invoke_opts)
-    cloudflare_account_id = cloudflare_accounts.results.apply(lambda results: results[0].id)
     tunnel_password = pulumi_random.RandomPassword('cloudflared', length=64)
     tunnel = cloudflare.ZeroTrustTunnelCloudflared(
         'tunnel',
-        account_id=cloudflare_account_id,
+        account_id=account_id,
         name='cloudflared-k8s',
         tunnel_secret=tunnel_password.result.apply(lambda p: base64.b64encode(p.encode()).decode()),
         config_src='cloudflare',
@@ -44,7 +44,7 @@ def create_cloudflared(
 
     # get tunnel token and store in secret:
     tunnel_token = cloudflare.get_zero_trust_tunnel_cloudflared_token_output(
-        account_id=cloudflare_account_id, tunnel_id=tunnel.id, opts=cloudflare_invoke_opts
+        account_id=account_id, tunnel_id=tunnel.id, opts=cloudflare_invoke_opts
     )
 
     secret = k8s.core.v1.Secret(
@@ -57,6 +57,8 @@ def create_cloudflared(
 
     # deploy cloudflared:
     app_labels = {'app': 'cloudflared'}
+    cloudflared_config = component_config.cloudflared
+
     k8s.apps.v1.Deployment(
         'cloudflared',
         metadata={
@@ -64,19 +66,40 @@ def create_cloudflared(
         },
         spec={
             'selector': {'match_labels': app_labels},
-            'replicas': 1,
+            'replicas': cloudflared_config.replicas,
             'template': {
                 'metadata': {'labels': app_labels},
                 'spec': {
+                    # spread connectors across nodes to survive node maintenance:
+                    'affinity': {
+                        'pod_anti_affinity': {
+                            'preferred_during_scheduling_ignored_during_execution': [
+                                {
+                                    'weight': 100,
+                                    'pod_affinity_term': {
+                                        'label_selector': {'match_labels': app_labels},
+                                        'topology_key': 'kubernetes.io/hostname',
+                                    },
+                                }
+                            ],
+                        },
+                    },
                     'containers': [
                         {
                             'name': 'cloudflared',
-                            'image': f'cloudflare/cloudflared:{component_config.cloudflared.version}',
+                            'image': f'cloudflare/cloudflared:{cloudflared_config.version}',
                             'args': [
                                 'tunnel',
                                 '--no-autoupdate',
+                                '--protocol',
+                                cloudflared_config.protocol,
                                 'run',
                             ],
+                            'ports': [
+                                # scraped by Alloy:
+                                {'name': 'metrics', 'container_port': 8080},
+                            ],
+                            'resources': cloudflared_config.resources.to_k8s(),
                             'env': [
                                 {
                                     'name': 'TUNNEL_TOKEN',
@@ -109,20 +132,34 @@ def create_cloudflared(
         opts=k8s_opts,
     )
 
+    if cloudflared_config.pdb_max_unavailable:
+        k8s.policy.v1.PodDisruptionBudget(
+            'cloudflared',
+            metadata={'name': 'cloudflared'},
+            spec={
+                'selector': {'match_labels': app_labels},
+                'max_unavailable': cloudflared_config.pdb_max_unavailable,
+            },
+            opts=k8s_opts,
+        )
+
     ingress_rules = []
-    for ingress in component_config.cloudflared.ingress:
+    for ingress in cloudflared_config.ingress:
         rule: cloudflare.ZeroTrustTunnelCloudflaredConfigConfigIngressArgsDict = {
             'service': ingress.service,
             'hostname': ingress.hostname,
         }
+        origin_request = _get_origin_request(ingress.origin_request)
         if ingress.origin_server_name:
-            rule['origin_request'] = {'origin_server_name': ingress.origin_server_name}
+            origin_request['origin_server_name'] = ingress.origin_server_name
+        if origin_request:
+            rule['origin_request'] = origin_request
 
         ingress_rules.append(rule)
 
     cloudflare.ZeroTrustTunnelCloudflaredConfig(
         'cloudflared',
-        account_id=cloudflare_account_id,
+        account_id=account_id,
         tunnel_id=tunnel.id,
         config={
             'ingresses': [
@@ -130,25 +167,19 @@ def create_cloudflared(
                 # catch all rule:
                 {'service': 'http_status:404'},
             ],
+            'origin_request': _get_origin_request(cloudflared_config.origin_request),
         },
         opts=cloudflare_opts,
     )
 
-    # create DNS records for ingresses, see             #
-    # https://developers.cloudflare.com/cloudflare-one/connections/connect-networks/routing-to-tunnel/dns/#create-a-dns-record-for-the-tunnel:
-    zone = cloudflare.get_zone_output(
-        filter={'match': 'all', 'name': component_config.cloudflare.zone},
-        opts=p.InvokeOptions(provider=cloudflare_provider),
-    )
+    return tunnel
 
-    for ingress in component_config.cloudflared.ingress:
-        cloudflare.DnsRecord(
-            ingress.hostname,
-            proxied=True,
-            name=ingress.hostname.split('.')[0],
-            type='CNAME',
-            content=p.Output.format('{}.cfargotunnel.com', tunnel.id),
-            ttl=1,
-            zone_id=zone.zone_id,
-            opts=cloudflare_opts,
-        )
+
+def _get_origin_request(
+    config: CloudflareOriginRequestConfig,
+) -> cloudflare.ZeroTrustTunnelCloudflaredConfigConfigIngressOriginRequestArgsDict:
+    # field names match the provider arguments, unset ones are left to cloudflared:
+    return t.cast(
+        cloudflare.ZeroTrustTunnelCloudflaredConfigConfigIngressOriginRequestArgsDict,
+        config.model_dump(exclude_none=True),
+    )
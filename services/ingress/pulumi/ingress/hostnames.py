@@ -0,0 +1,63 @@
+"""Cloudflare zone and DNS records of the tunneled hostnames."""
+
+import pulumi as p
+import pulumi_cloudflare as cloudflare
+
+from ingress.model import CloudflareTunnelIngressConfig
+
+
+def get_zone(zone_name: str, cloudflare_provider: cloudflare.Provider):
+    """Zone of the tunneled hostnames, also providing the account the tunnel is created in."""
+    return cloudflare.get_zone_output(
+        filter={'match': 'all', 'name': zone_name},
+        opts=p.InvokeOptions(provider=cloudflare_provider),
+    )
+
+
+def get_record_name(hostname: str, zone_name: str) -> str:
+    """DNS record name of a hostname relative to its zone, `@` for the zone apex."""
+    hostname = hostname.rstrip('.').lower()
+    zone_name = zone_name.rstrip('.').lower()
+
+    if hostname == zone_name:
+        return '@'
+    if not hostname.endswith(f'.{zone_name}'):
+        raise ValueError(f'Hostname {hostname!r} is not part of zone {zone_name!r}.')
+    return hostname.removesuffix(f'.{zone_name}')
+
+
+def get_tunnel_hostnames(
+    ingresses: list[CloudflareTunnelIngressConfig], zone_name: str
+) -> dict[str, str]:
+    """Unique hostnames of the ingresses mapped to their record names, in a stable order."""
+    return {
+        hostname: get_record_name(hostname, zone_name)
+        for hostname in sorted({ingress.hostname for ingress in ingresses})
+    }
+
+
+def create_tunnel_dns_records(
+    ingresses: list[CloudflareTunnelIngressConfig],
+    zone_name: str,
+    zone_id: p.Input[str],
+    tunnel_id: p.Input[str],
+    cloudflare_provider: cloudflare.Provider,
+) -> list[cloudflare.DnsRecord]:
+    # see https://developers.cloudflare.com/cloudflare-one/connections/connect-networks/routing-to-tunnel/dns/#create-a-dns-record-for-the-tunnel:
+    cloudflare_opts = p.ResourceOptions(provider=cloudflare_provider)
+    tunnel_target = p.Output.format('{}.cfargotunnel.com', tunnel_id)
+
+    return [
+        cloudflare.DnsRecord(
+            # hostname as resource name to keep the records stable when ingresses are reordered:
+            hostname,
+            proxied=True,
+            name=record_name,
+            type='CNAME',
+            content=tunnel_target,
+            ttl=1,
+            zone_id=zone_id,
+            opts=cloudflare_opts,
+        )
+        for hostname, record_name in get_tunnel_hostnames(ingresses, zone_name).items()
+    ]
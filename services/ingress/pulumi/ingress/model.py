@@ -1,16 +1,61 @@
 """Configuration model."""
 
-from utils.model import CloudflareConfig, ConfigBaseModel, get_pulumi_project
+import typing as t
+
+import pydantic
+
+from utils.model import CloudflareConfig, ConfigBaseModel, ResourcesConfig, get_pulumi_project
+
+
+class CloudflareOriginRequestConfig(ConfigBaseModel):
+    # unset values fall back to the tunnel wide settings and then to the cloudflared defaults,
+    # durations are given in seconds:
+    keep_alive_connections: pydantic.PositiveInt | None = None
+    keep_alive_timeout: pydantic.PositiveInt | None = None
+    http2_origin: bool | None = None
+    connect_timeout: pydantic.PositiveInt | None = None
+    tcp_keep_alive: pydantic.PositiveInt | None = None
+    disable_chunked_encoding: bool | None = None
+    no_happy_eyeballs: bool | None = None
+
+
+class CloudflareCacheConfig(ConfigBaseModel):
+    # requests matching any path prefix or file extension are cached at the edge; only list
+    # public assets, cache rules ignore authentication:
+    path_prefixes: list[str] = []
+    extensions: list[str] = []
+    edge_ttl_sec: pydantic.PositiveInt = 24 * 60 * 60
+    # respect the Cache-Control header of the origin if unset:
+    browser_ttl_sec: pydantic.PositiveInt | None = None
+
+    @pydantic.model_validator(mode='after')
+    def _check_filters(self) -> t.Self:
+        if not self.path_prefixes and not self.extensions:
+            raise ValueError('Cache config requires path-prefixes or extensions.')
+        return self
 
 
 class CloudflareTunnelIngressConfig(ConfigBaseModel):
     service: str
     hostname: str
     origin_server_name: str | None = None
+    origin_request: CloudflareOriginRequestConfig = pydantic.Field(
+        default_factory=CloudflareOriginRequestConfig
+    )
+    cache: CloudflareCacheConfig | None = None
 
 
 class CloudflareDConfig(ConfigBaseModel):
     version: str
+    # each connector opens its own connections to the Cloudflare edge:
+    replicas: pydantic.PositiveInt = 2
+    protocol: t.Literal['quic', 'http2', 'auto'] = 'quic'
+    resources: ResourcesConfig = pydantic.Field(default_factory=ResourcesConfig)
+    pdb_max_unavailable: pydantic.PositiveInt | None = 1
+    # origin connection settings applied to all ingresses:
+    origin_request: CloudflareOriginRequestConfig = pydantic.Field(
+        default_factory=CloudflareOriginRequestConfig
+    )
     ingress: list[CloudflareTunnelIngressConfig] = []
 
 
@@ -0,0 +1,103 @@
+"""Cloudflare cache rules rendered against the Pulumi mocks."""
+
+import typing as t
+import unittest
+
+import pulumi as p
+import pulumi_cloudflare as cloudflare
+
+from ingress.cache import create_cache_rules
+from ingress.model import CloudflareTunnelIngressConfig
+
+
+class Mocks(p.runtime.Mocks):
+    def __init__(self) -> None:
+        self.resources: dict[str, p.runtime.MockResourceArgs] = {}
+
+    @t.override
+    def new_resource(self, args: p.runtime.MockResourceArgs) -> tuple[str | None, dict]:
+        self.resources[args.name] = args
+        return f'{args.name}-id', args.inputs
+
+    @t.override
+    def call(self, args: p.runtime.MockCallArgs) -> tuple[dict, list[tuple[str, str]] | None]:
+        return {}, None
+
+
+mocks = Mocks()
+p.runtime.set_mocks(mocks)
+
+
+def get_ingress(hostname: str, cache: dict | None = None) -> CloudflareTunnelIngressConfig:
+    return CloudflareTunnelIngressConfig.model_validate({
+        'service': 'http://paperless:8000',
+        'hostname': hostname,
+        'cache': cache,
+    })
+
+
+class CacheRulesTest(unittest.TestCase):
+    @t.override
+    def setUp(self) -> None:
+        mocks.resources.clear()
+
+    @p.runtime.test
+    def test_ruleset(self) -> p.Output[None]:
+        provider = cloudflare.Provider('cloudflare')
+        ruleset = create_cache_rules(
+            [
+                get_ingress(
+                    'docs.example.com',
+                    {'path-prefixes': ['/static/'], 'extensions': ['.js', 'css']},
+                ),
+                get_ingress('plain.example.com'),
+                get_ingress('"odd".example.com', {'extensions': ['woff2'], 'browser-ttl-sec': 60}),
+            ],
+            'zone-id',
+            provider,
+        )
+        assert ruleset is not None
+
+        def check(_: str) -> None:
+            inputs = mocks.resources['cache-rules'].inputs
+            self.assertEqual(inputs['zoneId'], 'zone-id')
+            self.assertEqual(inputs['kind'], 'zone')
+            self.assertEqual(inputs['phase'], 'http_request_cache_settings')
+
+            static, odd = inputs['rules']
+            self.assertEqual(
+                static['expression'],
+                '(http.host eq "docs.example.com" and ('
+                'starts_with(http.request.uri.path, "/static/")'
+                ' or http.request.uri.path.extension in {"js" "css"}))',
+            )
+            self.assertEqual(static['action'], 'set_cache_settings')
+            self.assertEqual(
+                static['actionParameters'],
+                {
+                    'cache': True,
+                    'edgeTtl': {'mode': 'override_origin', 'default': 86400},
+                    'browserTtl': {'mode': 'respect_origin'},
+                },
+            )
+
+            self.assertEqual(
+                odd['expression'],
+                '(http.host eq "\\"odd\\".example.com" and ('
+                'http.request.uri.path.extension in {"woff2"}))',
+            )
+            self.assertEqual(
+                odd['actionParameters']['browserTtl'], {'mode': 'override_origin', 'default': 60}
+            )
+
+        return ruleset.id.apply(check)
+
+    @p.runtime.test
+    def test_no_cached_ingresses(self) -> None:
+        provider = cloudflare.Provider('cloudflare')
+        self.assertIsNone(create_cache_rules([get_ingress('plain.example.com')], 'zone', provider))
+        self.assertNotIn('cache-rules', mocks.resources)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,10 +3,12 @@
 import pulumi as p
 import pulumi_kubernetes as k8s
 
-from kubernetes.model import ComponentConfig
+from kubernetes.model import ComponentConfig, MetalLbBgpConfig
 
 
-def ensure_metallb(component_config: ComponentConfig, k8s_provider: k8s.Provider) -> p.Resource:
+def ensure_metallb(
+    component_config: ComponentConfig, k8s_provider: k8s.Provider
+) -> list[k8s.apiextensions.CustomResource]:
     ns = k8s.core.v1.Namespace(
         'metallb-system',
         metadata={
@@ -39,30 +41,88 @@ def ensure_metallb(component_config: ComponentConfig, k8s_provider: k8s.Provider
         opts=k8s_opts,
     )
 
+    metallb_opts = p.ResourceOptions.merge(k8s_opts, p.ResourceOptions(depends_on=[metallb]))
+    metallb_config = component_config.metallb
+
+    address_pools = [
+        k8s.apiextensions.CustomResource(
+            pool.name,
+            api_version='metallb.io/v1beta1',
+            kind='IPAddressPool',
+            metadata={
+                'name': pool.name,
+            },
+            spec={
+                'addresses': ['-'.join((str(pool.ipv4_start), str(pool.ipv4_end)))],
+                'autoAssign': pool.auto_assign,
+            },
+            opts=metallb_opts,
+        )
+        for pool in metallb_config.pools
+    ]
+
+    if l2_pools := [pool.name for pool in metallb_config.pools if pool.l2]:
+        k8s.apiextensions.CustomResource(
+            'default-l2-advertisment',
+            api_version='metallb.io/v1beta1',
+            kind='L2Advertisement',
+            metadata={
+                'name': 'default-l2-advertisment',
+            },
+            spec={
+                'ipAddressPools': l2_pools,
+            },
+            opts=p.ResourceOptions.merge(metallb_opts, p.ResourceOptions(depends_on=address_pools)),
+        )
+
+    bgp_pools = [pool.name for pool in metallb_config.pools if pool.bgp]
+    if metallb_config.bgp and bgp_pools:
+        _create_bgp_advertisement(
+            metallb_config.bgp,
+            bgp_pools,
+            p.ResourceOptions.merge(metallb_opts, p.ResourceOptions(depends_on=address_pools)),
+        )
+
+    return address_pools
+
+
+def _create_bgp_advertisement(
+    bgp_config: MetalLbBgpConfig,
+    pool_names: list[str],
+    metallb_opts: p.ResourceOptions,
+):
+    for peer in bgp_config.peers:
+        k8s.apiextensions.CustomResource(
+            f'bgp-peer-{peer.name}',
+            api_version='metallb.io/v1beta2',
+            kind='BGPPeer',
+            metadata={
+                'name': peer.name,
+            },
+            spec={
+                'myASN': bgp_config.my_asn,
+                'peerASN': peer.asn,
+                'peerAddress': str(peer.address),
+                **({'peerPort': peer.port} if peer.port else {}),
+                **({'holdTime': peer.hold_time} if peer.hold_time else {}),
+            },
+            opts=metallb_opts,
+        )
+
+    # every node announces the service IPs, the peers distribute traffic across them with ECMP:
     k8s.apiextensions.CustomResource(
-        'default',
+        'default-bgp-advertisement',
         api_version='metallb.io/v1beta1',
-        kind='IPAddressPool',
+        kind='BGPAdvertisement',
         metadata={
-            'name': 'default',
+            'name': 'default-bgp-advertisement',
         },
         spec={
-            'addresses': [
-                '-'.join((
-                    str(component_config.metallb.ipv4_start),
-                    str(component_config.metallb.ipv4_end),
-                ))
-            ],
-        },
-        opts=p.ResourceOptions.merge(k8s_opts, p.ResourceOptions(depends_on=[metallb])),
-    )
-
-    return k8s.apiextensions.CustomResource(
-        'default-l2-advertisment',
-        api_version='metallb.io/v1beta1',
-        kind='L2Advertisement',
-        metadata={
-            'name': 'default-l2-advertisment',
+            'ipAddressPools': pool_names,
+            'aggregationLength': bgp_config.aggregation_length,
+            **({'localPref': bgp_config.local_pref} if bgp_config.local_pref is not None else {}),
+            **({'communities': bgp_config.communities} if bgp_config.communities else {}),
+            'peers': [peer.name for peer in bgp_config.peers],
         },
-        opts=p.ResourceOptions.merge(k8s_opts, p.ResourceOptions(depends_on=[metallb])),
+        opts=metallb_opts,
     )
@@ -15,6 +15,7 @@ from kubernetes.cert_manager import ensure_cert_manager
 from kubernetes.metallb import ensure_metallb
 from kubernetes.model import ComponentConfig
 from kubernetes.samba import ensure_smb
+from kubernetes.storage import ensure_storage_classes
 from kubernetes.traefik import ensure_traefik
 
 
@@ -55,7 +56,10 @@ def create_microk8s(component_config: ComponentConfig, proxmox_provider: proxmox
                     | {
                         'username': component_config.microk8s.ssh_user,
                         'ssh_public_key': component_config.microk8s.ssh_public_key,
-                        'data_disk_mount': component_config.microk8s.data_disk_mount,
+                        'storage_tiers': [
+                            tier.model_dump() for tier in component_config.microk8s.storage_tiers
+                        ],
+                        'tuning_profile': component_config.microk8s.tuning_profile.model_dump(),
                     }
                 ),
                 'file_name': f'cloud-config-{master_config.name}.yaml',
@@ -115,6 +119,22 @@ def create_microk8s(component_config: ComponentConfig, proxmox_provider: proxmox
                         'read': 10000,
                     },
                 },
+                *(
+                    {
+                        'interface': tier.virtual_disk.interface,
+                        'size': tier.virtual_disk.size_gb,
+                        'datastore_id': tier.virtual_disk.datastore_id,
+                        'iothread': True,
+                        'discard': 'on',
+                        'file_format': 'raw',
+                        # hack to avoid diff in subsequent runs:
+                        'speed': {
+                            'read': 10000,
+                        },
+                    }
+                    for tier in component_config.microk8s.storage_tiers
+                    if tier.virtual_disk
+                ),
             ],
             network_devices=[
                 {
@@ -200,68 +220,7 @@ def create_microk8s(component_config: ComponentConfig, proxmox_provider: proxmox
             enable_server_side_apply=True,
         )
 
-        k8s_opts = p.ResourceOptions(provider=k8s_provider)
-
-        # create hostpath storage class to use mounted data disk:
-        k8s.storage.v1.StorageClass(
-            'data-hostpath',
-            metadata={
-                'name': 'data-hostpath',
-                'annotations': {
-                    'storageclass.kubernetes.io/is-default-class': 'true',
-                },
-            },
-            provisioner='microk8s.io/hostpath',
-            parameters={'pvDir': component_config.microk8s.data_disk_mount},
-            reclaim_policy='Delete',
-            volume_binding_mode='WaitForFirstConsumer',
-            opts=k8s_opts,
-        )
-
-        # create second hostpath storage class for precious data:
-        k8s.storage.v1.StorageClass(
-            'data-hostpath-retained',
-            metadata={
-                'name': 'data-hostpath-retained',
-            },
-            provisioner='microk8s.io/hostpath',
-            parameters={'pvDir': component_config.microk8s.data_disk_mount},
-            reclaim_policy='Retain',
-            volume_binding_mode='WaitForFirstConsumer',
-            opts=k8s_opts,
-        )
-
-        # create hostpath storage class for retained bulk observability data:
-        k8s.storage.v1.StorageClass(
-            'bulk-hostpath-retained',
-            metadata={
-                'name': component_config.microk8s.bulk_storage_class_name,
-                'annotations': {
-                    'storageclass.kubernetes.io/is-default-class': 'false',
-                },
-            },
-            provisioner='microk8s.io/hostpath',
-            parameters={'pvDir': component_config.microk8s.bulk_storage_mount},
-            reclaim_policy='Retain',
-            volume_binding_mode='WaitForFirstConsumer',
-            allow_volume_expansion=True,
-            opts=k8s_opts,
-        )
-
-        # remove the default annotation from the hostpath storage class (just setting the pvDir
-        # parameter is not possible as patches do not allow for parameter updates):
-        k8s.storage.v1.StorageClassPatch(
-            'hostpath-old-default-removal',
-            metadata={
-                # name as given by microk8s:
-                'name': 'microk8s-hostpath',
-                'annotations': {
-                    'storageclass.kubernetes.io/is-default-class': 'false',
-                    'pulumi.com/patchForce': 'true',
-                },
-            },
-            opts=k8s_opts,
-        )
+        ensure_storage_classes(component_config, k8s_provider)
 
         metallb = ensure_metallb(component_config, k8s_provider)
         cert_manager = ensure_cert_manager(component_config, k8s_provider)
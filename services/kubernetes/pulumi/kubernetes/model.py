@@ -1,10 +1,18 @@
 """Configuration model."""
 
 import ipaddress
+import typing as t
 
 import pydantic
 
-from utils.model import CloudflareConfig, ConfigBaseModel, EnvVarRef, get_pulumi_project
+from utils.model import (
+    CloudflareConfig,
+    ConfigBaseModel,
+    EnvVarRef,
+    ResourcesConfig,
+    TuningProfileConfig,
+    get_pulumi_project,
+)
 
 
 class ProxmoxConfig(ConfigBaseModel):
@@ -19,18 +27,119 @@ class CertManagerConfig(ConfigBaseModel):
     acme_email: pydantic.EmailStr
 
 
+class TraefikAutoscalingConfig(ConfigBaseModel):
+    min_replicas: pydantic.PositiveInt = 2
+    max_replicas: pydantic.PositiveInt = 4
+    cpu_utilization_percent: pydantic.PositiveInt | None = 80
+    # average requests per second per pod, requires a custom metrics adapter serving the metric:
+    requests_per_second: pydantic.PositiveInt | None = None
+    requests_per_second_metric: str = 'traefik_entrypoint_requests_per_second'
+
+    @pydantic.model_validator(mode='after')
+    def _check_metrics(self) -> t.Self:
+        if not self.cpu_utilization_percent and not self.requests_per_second:
+            raise ValueError(
+                'Autoscaling requires a CPU utilization or requests per second target.'
+            )
+        if self.min_replicas > self.max_replicas:
+            raise ValueError('Autoscaling min-replicas must not exceed max-replicas.')
+        return self
+
+
+class TraefikTlsConfig(ConfigBaseModel):
+    # key of the wildcard certificate, e.g. ECDSA with size 256 for P-256:
+    certificate_key_algorithm: t.Literal['RSA', 'ECDSA', 'Ed25519'] = 'RSA'
+    certificate_key_size: pydantic.PositiveInt | None = None
+    min_version: t.Literal['VersionTLS12', 'VersionTLS13'] = 'VersionTLS12'
+    # TLS 1.2 cipher suites in order of preference, TLS 1.3 suites are not configurable:
+    cipher_suites: list[str] = pydantic.Field(
+        default_factory=lambda: [
+            'TLS_ECDHE_ECDSA_WITH_AES_128_GCM_SHA256',
+            'TLS_ECDHE_ECDSA_WITH_CHACHA20_POLY1305_SHA256',
+            'TLS_ECDHE_ECDSA_WITH_AES_256_GCM_SHA384',
+            'TLS_ECDHE_RSA_WITH_AES_128_GCM_SHA256',
+            'TLS_ECDHE_RSA_WITH_CHACHA20_POLY1305_SHA256',
+            'TLS_ECDHE_RSA_WITH_AES_256_GCM_SHA384',
+        ]
+    )
+    curve_preferences: list[str] = pydantic.Field(
+        default_factory=lambda: ['X25519', 'CurveP256', 'CurveP384']
+    )
+
+
 class TraefikConfig(ConfigBaseModel):
     version: str
+    replicas: pydantic.PositiveInt = 1
+    # replaces the static replica count if set:
+    autoscaling: TraefikAutoscalingConfig | None = None
+    resources: ResourcesConfig = pydantic.Field(default_factory=ResourcesConfig)
+    # prefer spreading replicas across nodes, still schedules on single node clusters:
+    spread_across_nodes: bool = True
+    pdb_max_unavailable: pydantic.PositiveInt | None = 1
+    # MetalLB address pool of the load balancer service, auto assigned if unset:
+    address_pool: str | None = None
+    # expose the dashboard API unauthenticated on the pod port for kubectl port-forwarding:
+    insecure_api: bool = True
+    # latency histogram buckets in seconds of the entrypoint, router and service metrics:
+    metrics_buckets: list[float] = pydantic.Field(
+        default_factory=lambda: [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+    )
+    access_logs: bool = True
+    tls: TraefikTlsConfig = pydantic.Field(default_factory=TraefikTlsConfig)
+    # HTTP/3 over QUIC on websecure, exposed as UDP port on the load balancer service:
+    http3: bool = False
 
 
 class CsiDriverSmbConfig(ConfigBaseModel):
     version: str
 
 
-class MetalLbConfig(ConfigBaseModel):
+class OpenEbsLvmConfig(ConfigBaseModel):
     version: str
+
+
+class MetalLbBgpPeerConfig(ConfigBaseModel):
+    name: str
+    address: ipaddress.IPv4Address
+    asn: pydantic.PositiveInt
+    port: pydantic.PositiveInt | None = None
+    hold_time: str | None = None
+
+
+class MetalLbBgpConfig(ConfigBaseModel):
+    my_asn: pydantic.PositiveInt
+    # e.g. the UniFi gateway, every node peers with all of them and traffic is split with ECMP:
+    peers: list[MetalLbBgpPeerConfig]
+    aggregation_length: int = pydantic.Field(default=32, ge=0, le=32)
+    local_pref: pydantic.NonNegativeInt | None = None
+    communities: list[str] = pydantic.Field(default_factory=list)
+
+
+class MetalLbPoolConfig(ConfigBaseModel):
+    name: str
     ipv4_start: ipaddress.IPv4Address
     ipv4_end: ipaddress.IPv4Address
+    # pools without auto assignment are only used by services pinned to them by annotation:
+    auto_assign: bool = True
+    l2: bool = True
+    # only effective if BGP is configured:
+    bgp: bool = True
+
+
+class MetalLbConfig(ConfigBaseModel):
+    version: str
+    pools: list[MetalLbPoolConfig]
+    bgp: MetalLbBgpConfig | None = None
+
+    @pydantic.model_validator(mode='after')
+    def _check_pools(self) -> t.Self:
+        names = [pool.name for pool in self.pools]
+        if len(names) != len(set(names)):
+            raise ValueError(f'MetalLB pool names must be unique: {names}.')
+        for pool in self.pools:
+            if not pool.l2 and not (pool.bgp and self.bgp):
+                raise ValueError(f'MetalLB pool {pool.name!r} is neither advertised by L2 nor BGP.')
+        return self
 
 
 class VirtualMachineConfig(ConfigBaseModel):
@@ -44,6 +153,65 @@ class VirtualMachineConfig(ConfigBaseModel):
     data_disk_size_gb: pydantic.PositiveInt
 
 
+class StorageClassConfig(ConfigBaseModel):
+    name: str
+    reclaim_policy: t.Literal['Delete', 'Retain'] = 'Delete'
+    allow_volume_expansion: bool = False
+    default: bool = False
+
+
+class VirtualDiskConfig(ConfigBaseModel):
+    interface: str
+    size_gb: pydantic.PositiveInt
+    datastore_id: str = 'local-lvm'
+
+
+class StorageTierConfig(ConfigBaseModel):
+    name: str
+    # hostpath tiers are mounted and shared by all volumes, lvm tiers carve a logical volume per
+    # PVC out of the tier volume group and report their free capacity to the scheduler:
+    provisioner: t.Literal['hostpath', 'lvm'] = 'hostpath'
+    mount: str | None = None
+    # block device of the tier, without a device the tier is a directory on the root disk:
+    device: str | None = None
+    # partition and format the device on first boot, disable for pre-formatted disks:
+    format: bool = True
+    filesystem: str = 'ext4'
+    mount_options: list[str] = pydantic.Field(default_factory=list)
+    # additional virtual disk attached to every master node to back the tier:
+    virtual_disk: VirtualDiskConfig | None = None
+    storage_classes: list[StorageClassConfig]
+
+    @pydantic.computed_field
+    @property
+    def volume_group(self) -> str:
+        return f'{self.name}-vg'
+
+    @pydantic.model_validator(mode='after')
+    def _check_device(self) -> t.Self:
+        if self.virtual_disk and not self.device:
+            raise ValueError(f'Storage tier {self.name!r} has a virtual disk but no device.')
+        if self.provisioner == 'hostpath' and not self.mount:
+            raise ValueError(f'Hostpath storage tier {self.name!r} requires a mount.')
+        if self.provisioner == 'lvm' and not self.device:
+            raise ValueError(f'LVM storage tier {self.name!r} requires a device.')
+        return self
+
+
+def _default_storage_tiers() -> list[StorageTierConfig]:
+    return [
+        StorageTierConfig(
+            name='data',
+            mount='/mnt/data',
+            device='/dev/vdb',
+            storage_classes=[
+                StorageClassConfig(name='data-hostpath', default=True),
+                StorageClassConfig(name='data-hostpath-retained', reclaim_policy='Retain'),
+            ],
+        )
+    ]
+
+
 class MicroK8sConfig(ConfigBaseModel):
     cloud_image_url: pydantic.HttpUrl = pydantic.Field(
         default=pydantic.HttpUrl(
@@ -54,10 +222,19 @@ class MicroK8sConfig(ConfigBaseModel):
     ssh_public_key: str
     vlan_id: pydantic.PositiveInt | None = None
     master_nodes: list[VirtualMachineConfig]
-    data_disk_mount: str = '/mnt/data'
-    bulk_storage_mount: str = '/mnt/bulk'
-    bulk_storage_class_name: str = 'bulk-hostpath-retained'
+    storage_tiers: list[StorageTierConfig] = pydantic.Field(default_factory=_default_storage_tiers)
     sub_domain: str | None = None
+    tuning_profile: TuningProfileConfig = pydantic.Field(default_factory=TuningProfileConfig)
+
+    @pydantic.model_validator(mode='after')
+    def _check_storage_classes(self) -> t.Self:
+        storage_classes = [sc for tier in self.storage_tiers for sc in tier.storage_classes]
+        names = [sc.name for sc in storage_classes]
+        if len(names) != len(set(names)):
+            raise ValueError(f'Storage class names must be unique: {names}.')
+        if sum(sc.default for sc in storage_classes) > 1:
+            raise ValueError('At most one storage class can be the default.')
+        return self
 
 
 class UnifyConfig(ConfigBaseModel):
@@ -75,6 +252,15 @@ class ComponentConfig(ConfigBaseModel):
     traefik: TraefikConfig
     unify: UnifyConfig = pydantic.Field(default_factory=UnifyConfig)
     csi_driver_smb: CsiDriverSmbConfig
+    openebs_lvm: OpenEbsLvmConfig | None = None
+
+    @pydantic.model_validator(mode='after')
+    def _check_openebs_lvm(self) -> t.Self:
+        if not self.openebs_lvm and any(
+            tier.provisioner == 'lvm' for tier in self.microk8s.storage_tiers
+        ):
+            raise ValueError('LVM storage tiers require the openebs-lvm configuration.')
+        return self
 
 
 class StackConfig(ConfigBaseModel):
@@ -46,13 +46,17 @@ def ensure_smb(component_config: ComponentConfig, k8s_provider: k8s.Provider):
         opts=k8s_opts.merge(p.ResourceOptions(depends_on=[csi_driver_smb])),
     )
 
-    def create_storage_classes(shares):
+    def create_storage_classes(args):
+        shares, share_mount_options = args
         for share in shares:
+            # per share performance profile as recommended by the samba stack:
+            mount_options = (share_mount_options or {}).get(share, [])
             _create_smb_storage_class(
                 f'samba-{share}',
                 samba_fqdn=samba_fqdn,
                 share=share,
                 reclaim_policy='Delete',
+                mount_options=mount_options,
                 smb_secret=smb_secret,
                 k8s_opts=k8s_opts,
             )
@@ -61,11 +65,15 @@ def ensure_smb(component_config: ComponentConfig, k8s_provider: k8s.Provider):
                 samba_fqdn=samba_fqdn,
                 share=share,
                 reclaim_policy='Retain',
+                mount_options=mount_options,
                 smb_secret=smb_secret,
                 k8s_opts=k8s_opts,
             )
 
-    samba_stack.get_output('smb-shares').apply(create_storage_classes)
+    p.Output.all(
+        samba_stack.get_output('smb-shares'),
+        samba_stack.get_output('smb-share-mount-options'),
+    ).apply(create_storage_classes)
 
 
 def _create_smb_storage_class(
@@ -74,6 +82,7 @@ def _create_smb_storage_class(
     samba_fqdn: p.Input[str],
     share: str,
     reclaim_policy: str,
+    mount_options: list[str],
     smb_secret: k8s.core.v1.Secret,
     k8s_opts: p.ResourceOptions,
 ) -> k8s.storage.v1.StorageClass:
@@ -100,6 +109,7 @@ def _create_smb_storage_class(
             'file_mode=0664',
             'dir_mode=0775',
             'iocharset=utf8',
+            *mount_options,
         ],
         opts=k8s_opts,
     )
@@ -0,0 +1,105 @@
+"""Storage classes for the storage tiers of the MicroK8s nodes."""
+
+import pulumi as p
+import pulumi_kubernetes as k8s
+
+from kubernetes.model import ComponentConfig
+
+LVM_PROVISIONER = 'local.csi.openebs.io'
+
+
+def ensure_storage_classes(component_config: ComponentConfig, k8s_provider: k8s.Provider):
+    k8s_opts = p.ResourceOptions(provider=k8s_provider)
+
+    lvm_localpv = (
+        _ensure_lvm_localpv(component_config, k8s_provider)
+        if any(tier.provisioner == 'lvm' for tier in component_config.microk8s.storage_tiers)
+        else None
+    )
+
+    for tier in component_config.microk8s.storage_tiers:
+        if tier.provisioner == 'lvm':
+            # one logical volume per PVC in the tier volume group created by cloud-init:
+            provisioner = LVM_PROVISIONER
+            parameters = {
+                'storage': 'lvm',
+                'volgroup': tier.volume_group,
+                'fsType': tier.filesystem,
+            }
+            opts = p.ResourceOptions.merge(k8s_opts, p.ResourceOptions(depends_on=lvm_localpv))
+        else:
+            # hostpath directories below the tier mount set up by cloud-init:
+            provisioner = 'microk8s.io/hostpath'
+            parameters = {'pvDir': str(tier.mount)}
+            opts = k8s_opts
+
+        for storage_class in tier.storage_classes:
+            k8s.storage.v1.StorageClass(
+                storage_class.name,
+                metadata={
+                    'name': storage_class.name,
+                    'annotations': {
+                        'storageclass.kubernetes.io/is-default-class': str(
+                            storage_class.default
+                        ).lower(),
+                    },
+                },
+                provisioner=provisioner,
+                parameters=parameters,
+                reclaim_policy=storage_class.reclaim_policy,
+                # let the scheduler pick the node first, so the capacity of the tier is considered:
+                volume_binding_mode='WaitForFirstConsumer',
+                allow_volume_expansion=storage_class.allow_volume_expansion,
+                opts=opts,
+            )
+
+    # remove the default annotation from the hostpath storage class (just setting the pvDir
+    # parameter is not possible as patches do not allow for parameter updates):
+    k8s.storage.v1.StorageClassPatch(
+        'hostpath-old-default-removal',
+        metadata={
+            # name as given by microk8s:
+            'name': 'microk8s-hostpath',
+            'annotations': {
+                'storageclass.kubernetes.io/is-default-class': 'false',
+                'pulumi.com/patchForce': 'true',
+            },
+        },
+        opts=k8s_opts,
+    )
+
+
+def _ensure_lvm_localpv(
+    component_config: ComponentConfig, k8s_provider: k8s.Provider
+) -> k8s.helm.v3.Release:
+    assert component_config.openebs_lvm, 'only called for LVM storage tiers'
+
+    ns = k8s.core.v1.Namespace(
+        'openebs',
+        metadata={
+            'name': 'openebs',
+        },
+        opts=p.ResourceOptions(provider=k8s_provider),
+    )
+
+    namespaced_k8s_provider = k8s.Provider(
+        'openebs-provider',
+        kubeconfig=k8s_provider.kubeconfig,  # pyright: ignore[reportAttributeAccessIssue]
+        namespace=ns.metadata.name,
+    )
+
+    return k8s.helm.v3.Release(
+        'lvm-localpv',
+        chart='lvm-localpv',
+        version=component_config.openebs_lvm.version,
+        repository_opts={'repo': 'https://openebs.github.io/lvm-localpv'},
+        values={
+            # publish CSIStorageCapacity objects per node and volume group for the scheduler:
+            'storageCapacity': True,
+            'lvmNode': {
+                # kubelet state lives inside the snap on MicroK8s:
+                'kubeletDir': '/var/snap/microk8s/common/var/lib/kubelet/',
+            },
+        },
+        opts=p.ResourceOptions(provider=namespaced_k8s_provider),
+    )
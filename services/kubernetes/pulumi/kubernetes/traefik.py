@@ -1,19 +1,20 @@
 """Installation of traefik ingress controller."""
 
 import os
+import typing as t
 
 import pulumi as p
 import pulumi_kubernetes as k8s
 
 from utils import unify
 
-from kubernetes.model import ComponentConfig
+from kubernetes.model import ComponentConfig, TraefikConfig
 
 
 def ensure_traefik(
     component_config: ComponentConfig,
     *,
-    metallb: p.Resource,
+    metallb: list[k8s.apiextensions.CustomResource],
     cert_manager: p.Resource,
     k8s_provider: k8s.Provider,
 ):
@@ -32,20 +33,84 @@ def ensure_traefik(
     )
     k8s_opts = p.ResourceOptions(provider=namespaced_k8s_provider)
 
+    traefik_config = component_config.traefik
+    additional_arguments = []
+    if traefik_config.insecure_api:
+        # expose the API directly from the pod to allow getting access to dashboard at
+        # http://localhost:8080/ after kubectl port-forwarding:
+        additional_arguments.append('--api.insecure=true')
+
     traefik = k8s.helm.v3.Release(
         'traefik',
         chart='traefik',
-        version=component_config.traefik.version,
+        version=traefik_config.version,
         repository_opts={'repo': 'https://traefik.github.io/charts'},
         values={
-            'additionalArguments': [
-                # expose the API directly from the pod to allow getting access to dashboard at
-                # http://localhost:8080/ after kubectl port-forwarding:
-                '--api.insecure=true',
-            ]
+            'additionalArguments': additional_arguments,
+            'deployment': {
+                'replicas': traefik_config.replicas,
+            },
+            'service': {
+                'annotations': (
+                    {'metallb.io/address-pool': traefik_config.address_pool}
+                    if traefik_config.address_pool
+                    else {}
+                ),
+            },
+            'autoscaling': _get_autoscaling_values(traefik_config),
+            'resources': traefik_config.resources.to_k8s(),
+            'topologySpreadConstraints': (
+                [
+                    {
+                        'maxSkew': 1,
+                        'topologyKey': 'kubernetes.io/hostname',
+                        'whenUnsatisfiable': 'ScheduleAnyway',
+                        'labelSelector': {
+                            'matchLabels': {'app.kubernetes.io/name': 'traefik'},
+                        },
+                    }
+                ]
+                if traefik_config.spread_across_nodes
+                else []
+            ),
+            'podDisruptionBudget': (
+                {'enabled': True, 'maxUnavailable': traefik_config.pdb_max_unavailable}
+                if traefik_config.pdb_max_unavailable
+                else {'enabled': False}
+            ),
+            # scraped by Alloy from the pod's metrics port:
+            'metrics': {
+                'prometheus': {
+                    'entryPoint': 'metrics',
+                    'addEntryPointsLabels': True,
+                    'addRoutersLabels': True,
+                    'addServicesLabels': True,
+                    'buckets': ','.join(str(b) for b in traefik_config.metrics_buckets),
+                },
+            },
+            'ports': {
+                'websecure': {
+                    'http3': {
+                        'enabled': traefik_config.http3,
+                        'advertisedPort': 443,
+                    },
+                },
+            },
+            # JSON logs on stdout, parsed by Alloy into Loki labels:
+            'logs': {
+                'general': {'format': 'json'},
+                'access': {
+                    'enabled': traefik_config.access_logs,
+                    'format': 'json',
+                    'fields': {
+                        'general': {'defaultmode': 'keep'},
+                        'headers': {'defaultmode': 'drop'},
+                    },
+                },
+            },
         },
         # depend on metallb to ensure the service gets a public IP queried below:
-        opts=p.ResourceOptions.merge(k8s_opts, p.ResourceOptions(depends_on=[metallb])),
+        opts=p.ResourceOptions.merge(k8s_opts, p.ResourceOptions(depends_on=metallb)),
     )
 
     service = traefik.status.apply(
@@ -59,6 +124,21 @@ def ensure_traefik(
     ipv4 = service.status.load_balancer.ingress[0].ip
     p.export('app-ipv4', ipv4)
 
+    # default TLS options of all routers, session tickets stay enabled (Go default) for fast
+    # resumption of returning clients:
+    k8s.apiextensions.CustomResource(
+        'tls-option-default',
+        api_version='traefik.io/v1alpha1',
+        kind='TLSOption',
+        metadata={'name': 'default'},
+        spec={
+            'minVersion': traefik_config.tls.min_version,
+            'cipherSuites': traefik_config.tls.cipher_suites,
+            'curvePreferences': traefik_config.tls.curve_preferences,
+        },
+        opts=p.ResourceOptions.merge(k8s_opts, p.ResourceOptions(depends_on=[traefik])),
+    )
+
     p.export('app-sub-domain', component_config.microk8s.sub_domain)
     if component_config.microk8s.sub_domain:
         wildcard_domain = f'*.{component_config.microk8s.sub_domain}'
@@ -79,6 +159,16 @@ def ensure_traefik(
             spec={
                 'secretName': 'certificate',
                 'dnsNames': [wildcard_domain],
+                'privateKey': {
+                    'algorithm': traefik_config.tls.certificate_key_algorithm,
+                    **(
+                        {'size': traefik_config.tls.certificate_key_size}
+                        if traefik_config.tls.certificate_key_size
+                        else {}
+                    ),
+                    # generate a new key on renewal, required to switch the key algorithm:
+                    'rotationPolicy': 'Always',
+                },
                 'issuerRef': {
                     'kind': 'ClusterIssuer',
                     'name': 'lets-encrypt',
@@ -114,3 +204,40 @@ def ensure_traefik(
             ipv4=ipv4,
             provider=dns_provider,
         )
+
+
+def _get_autoscaling_values(traefik_config: TraefikConfig) -> dict[str, t.Any]:
+    autoscaling = traefik_config.autoscaling
+    if not autoscaling:
+        return {'enabled': False}
+
+    metrics: list[dict[str, t.Any]] = []
+    if autoscaling.cpu_utilization_percent:
+        metrics.append({
+            'type': 'Resource',
+            'resource': {
+                'name': 'cpu',
+                'target': {
+                    'type': 'Utilization',
+                    'averageUtilization': autoscaling.cpu_utilization_percent,
+                },
+            },
+        })
+    if autoscaling.requests_per_second:
+        metrics.append({
+            'type': 'Pods',
+            'pods': {
+                'metric': {'name': autoscaling.requests_per_second_metric},
+                'target': {
+                    'type': 'AverageValue',
+                    'averageValue': str(autoscaling.requests_per_second),
+                },
+            },
+        })
+
+    return {
+        'enabled': True,
+        'minReplicas': autoscaling.min_replicas,
+        'maxReplicas': autoscaling.max_replicas,
+        'metrics': metrics,
+    }
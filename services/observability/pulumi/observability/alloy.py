@@ -11,6 +11,7 @@ from observability.gateway import service_http_url
 from observability.model import ComponentConfig, StaticScrapeTarget
 
 ALLOY_SERVICE_NAME = 'alloy'
+ALLOY_LOAD_BALANCER_SERVICE_NAME = 'alloy-lb'
 ALLOY_OTLP_GRPC_PORT = 4317
 ALLOY_OTLP_HTTP_PORT = 4318
 ALLOY_LOKI_PUSH_PORT = 3100
@@ -49,7 +50,7 @@ def create_alloy(
             'alloy': {
                 'configMap': {
                     'content': create_alloy_config(
-                        static_scrape_targets=component_config.alloy.static_scrape_targets,
+                        static_scrape_targets=get_static_scrape_targets(component_config),
                         loki_gateway=loki_gateway,
                         mimir_gateway=mimir_gateway,
                     ),
@@ -84,11 +85,41 @@ def create_alloy(
 
     create_alloy_cluster_metrics_rbac(alloy, k8s_opts)
     service = create_alloy_gateway_service(alloy, k8s_opts)
+    if component_config.alloy.load_balancer_address_pool:
+        create_alloy_load_balancer_service(
+            alloy,
+            component_config.alloy.load_balancer_address_pool,
+            k8s_opts,
+        )
     export_alloy_endpoints()
 
     return alloy, service
 
 
+def get_static_scrape_targets(
+    component_config: ComponentConfig,
+) -> p.Output[list[StaticScrapeTarget]]:
+    """Static scrape targets from config and from the outputs of other stacks."""
+    stack_scrape_targets = [
+        p.StackReference(f'{p.get_organization()}/{project}/{p.get_stack()}').get_output(
+            'scrape-targets'
+        )
+        for project in component_config.alloy.scrape_target_stacks
+    ]
+
+    return p.Output.all(*stack_scrape_targets).apply(
+        lambda stack_targets: [
+            *component_config.alloy.static_scrape_targets,
+            *(
+                StaticScrapeTarget.model_validate(target)
+                for targets in stack_targets
+                # stacks may not export targets, e.g. with metrics disabled:
+                for target in targets or []
+            ),
+        ]
+    )
+
+
 def create_static_scrape_target_secret(
     static_scrape_targets: list[StaticScrapeTarget],
     k8s_opts: p.ResourceOptions,
@@ -144,7 +175,7 @@ def alloy_static_scrape_target_secret_mounts(
 
 def create_alloy_config(
     *,
-    static_scrape_targets: list[StaticScrapeTarget],
+    static_scrape_targets: p.Input[list[StaticScrapeTarget]],
     loki_gateway: k8s.core.v1.Service,
     mimir_gateway: k8s.core.v1.Service,
 ) -> p.Output[str]:
@@ -212,31 +243,63 @@ def create_alloy_gateway_service(
         ALLOY_SERVICE_NAME,
         metadata={'name': ALLOY_SERVICE_NAME},
         spec={
-            'selector': {
-                'app.kubernetes.io/instance': alloy.status.name,
-                'app.kubernetes.io/name': 'alloy',
-            },
-            'ports': [
-                {
-                    'name': 'otlp-grpc',
-                    'port': ALLOY_OTLP_GRPC_PORT,
-                    'target_port': 'otlp-grpc',
-                },
-                {
-                    'name': 'otlp-http',
-                    'port': ALLOY_OTLP_HTTP_PORT,
-                    'target_port': 'otlp-http',
-                },
-                {
-                    'name': 'loki-push',
-                    'port': ALLOY_LOKI_PUSH_PORT,
-                    'target_port': 'loki-push',
-                },
-            ],
+            'selector': alloy_selector(alloy),
+            'ports': alloy_gateway_ports(),
+        },
+        opts=k8s_opts,
+    )
+
+
+def create_alloy_load_balancer_service(
+    alloy: k8s.helm.v3.Release,
+    address_pool: str,
+    k8s_opts: p.ResourceOptions,
+) -> k8s.core.v1.Service:
+    # pinned to its own pool, so ingestion does not share a VIP and L2 leader with web traffic:
+    service = k8s.core.v1.Service(
+        ALLOY_LOAD_BALANCER_SERVICE_NAME,
+        metadata={
+            'name': ALLOY_LOAD_BALANCER_SERVICE_NAME,
+            'annotations': {'metallb.io/address-pool': address_pool},
+        },
+        spec={
+            'type': 'LoadBalancer',
+            'selector': alloy_selector(alloy),
+            'ports': alloy_gateway_ports(),
         },
         opts=k8s_opts,
     )
 
+    p.export('alloy-load-balancer-ipv4', service.status.load_balancer.ingress[0].ip)
+    return service
+
+
+def alloy_selector(alloy: k8s.helm.v3.Release) -> dict[str, p.Input[str]]:
+    return {
+        'app.kubernetes.io/instance': alloy.status.name,
+        'app.kubernetes.io/name': 'alloy',
+    }
+
+
+def alloy_gateway_ports() -> list[k8s.core.v1.ServicePortArgsDict]:
+    return [
+        {
+            'name': 'otlp-grpc',
+            'port': ALLOY_OTLP_GRPC_PORT,
+            'target_port': 'otlp-grpc',
+        },
+        {
+            'name': 'otlp-http',
+            'port': ALLOY_OTLP_HTTP_PORT,
+            'target_port': 'otlp-http',
+        },
+        {
+            'name': 'loki-push',
+            'port': ALLOY_LOKI_PUSH_PORT,
+            'target_port': 'loki-push',
+        },
+    ]
+
 
 def export_alloy_endpoints() -> None:
     p.export(
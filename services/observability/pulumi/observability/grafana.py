@@ -6,6 +6,8 @@ import pulumi as p
 import pulumi_kubernetes as k8s
 import pulumi_random as random
 
+from utils.traefik import create_ingress_route
+
 from observability.constants import GRAFANA_CHART_URL
 from observability.gateway import service_http_url
 from observability.model import ComponentConfig
@@ -132,34 +134,14 @@ def create_grafana(
         )
     )
 
-    k8s.apiextensions.CustomResource(
+    create_ingress_route(
         'grafana-ingress',
-        api_version='traefik.io/v1alpha1',
-        kind='IngressRoute',
-        metadata={'name': 'grafana-ingress'},
-        spec={
-            'entryPoints': ['websecure'],
-            'routes': [
-                {
-                    'kind': 'Rule',
-                    'match': p.Output.concat(
-                        'Host(`',
-                        component_config.ingress.grafana_hostname,
-                        '`)',
-                    ),
-                    'services': [
-                        {
-                            'name': service.metadata.name,
-                            'namespace': service.metadata.namespace,
-                            'port': 'service',
-                        },
-                    ],
-                },
-            ],
-            # use default wildcard certificate:
-            'tls': {},
-        },
-        opts=k8s_opts,
+        hostname=component_config.ingress.grafana_hostname,
+        service_name=service.metadata.name,
+        service_namespace=service.metadata.namespace,
+        service_port='service',
+        middlewares_config=component_config.ingress.grafana_middlewares,
+        k8s_opts=k8s_opts,
     )
 
     p.export('grafana-hostname', component_config.ingress.grafana_hostname)
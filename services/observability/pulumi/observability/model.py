@@ -4,7 +4,12 @@ from typing import Literal
 
 import pydantic
 
-from utils.model import ConfigBaseModel, PulumiSecret, get_pulumi_project
+from utils.model import (
+    ConfigBaseModel,
+    IngressMiddlewaresConfig,
+    PulumiSecret,
+    get_pulumi_project,
+)
 
 
 class GrafanaConfig(ConfigBaseModel):
@@ -136,6 +141,20 @@ class AlloyConfig(ConfigBaseModel):
         default_factory=list,
         description='Explicit non-Kubernetes Prometheus scrape targets.',
     )
+    load_balancer_address_pool: str | None = pydantic.Field(
+        default=None,
+        description=(
+            'MetalLB address pool of an additional LoadBalancer service exposing the OTLP and '
+            'Loki push ports outside the cluster. Not created when unset.'
+        ),
+    )
+    scrape_target_stacks: list[str] = pydantic.Field(
+        default_factory=list,
+        description=(
+            'Pulumi projects whose `scrape-targets` stack output is added to the static scrape '
+            'targets.'
+        ),
+    )
 
 
 class KubeStateMetricsConfig(ConfigBaseModel):
@@ -144,6 +163,10 @@ class KubeStateMetricsConfig(ConfigBaseModel):
 
 class IngressConfig(ConfigBaseModel):
     grafana_hostname: str = pydantic.Field(description='Ingress hostname for Grafana.')
+    grafana_middlewares: IngressMiddlewaresConfig = pydantic.Field(
+        default_factory=IngressMiddlewaresConfig,
+        description='Traefik middlewares of the Grafana ingress route.',
+    )
     logs_hostname: str = pydantic.Field(description='Ingress hostname for external log ingestion.')
 
 
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Run the paperless document exporter and push its duration and changed files as OTLP metrics.
+
+Only documents with changed checksums and a changed manifest are written to the export share, the
+metrics are pushed to `OTEL_EXPORTER_OTLP_ENDPOINT` if set.
+"""
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+EXPORT_DIR = pathlib.Path('/usr/src/paperless/export')
+
+
+MANIFEST_PATH = EXPORT_DIR / 'manifest.json'
+MARKER_PATH = EXPORT_DIR / '.export-started'
+# manifest keys of the files exported per document:
+EXPORTED_FILE_KEYS = (
+    '__exported_file_name__',
+    '__exported_archive_name__',
+    '__exported_thumbnail_name__',
+)
+
+
+def get_exported_files() -> set[str]:
+    """Files referenced by the manifest of the export, relative to the export directory."""
+    try:
+        manifest = json.loads(MANIFEST_PATH.read_text())
+    except FileNotFoundError:
+        return set()
+    return {record[key] for record in manifest for key in EXPORTED_FILE_KEYS if record.get(key)}
+
+
+def count_changed_files(since_ns: int, exported_before: set[str]) -> int:
+    """Files written since `since_ns` and files dropped from the manifest since the last export."""
+    # the exporter keeps the mtime of the source files, a rewrite only changes the ctime:
+    written = sum(
+        1
+        for root, _, files in os.walk(EXPORT_DIR)
+        for name in files
+        if os.stat(os.path.join(root, name)).st_ctime_ns >= since_ns
+    )
+    return written + len(exported_before - get_exported_files())
+
+
+def push_metrics(endpoint: str, metrics: dict[str, tuple[str, float]]) -> None:
+    # attributes as given by OTEL_RESOURCE_ATTRIBUTES, e.g. `service.name=paperless-exporter`:
+    attributes = [
+        {'key': key, 'value': {'stringValue': value}}
+        for key, _, value in (
+            attribute.partition('=')
+            for attribute in os.environ.get('OTEL_RESOURCE_ATTRIBUTES', '').split(',')
+            if attribute
+        )
+    ]
+    now = str(time.time_ns())
+    body = {
+        'resourceMetrics': [
+            {
+                'resource': {'attributes': attributes},
+                'scopeMetrics': [
+                    {
+                        'scope': {'name': 'paperless-export'},
+                        'metrics': [
+                            {
+                                'name': name,
+                                'unit': unit,
+                                'gauge': {'dataPoints': [{'asDouble': value, 'timeUnixNano': now}]},
+                            }
+                            for name, (unit, value) in metrics.items()
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+    request = urllib.request.Request(
+        f'{endpoint.rstrip("/")}/v1/metrics',
+        data=json.dumps(body).encode(),
+        headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request, timeout=10):
+        pass
+
+
+def main() -> int:
+    # ctime on the share, so written files are compared with the clock of the SMB server:
+    MARKER_PATH.touch()
+    since_ns = MARKER_PATH.stat().st_ctime_ns
+    MARKER_PATH.unlink()
+    exported_before = get_exported_files()
+    start = time.monotonic()
+
+    result = subprocess.run(
+        [
+            'python3',
+            'manage.py',
+            'document_exporter',
+            str(EXPORT_DIR),
+            '--delete',
+            '--use-filename-format',
+            '--use-folder-prefix',
+            '--compare-checksums',
+            '--compare-json',
+            '--no-progress-bar',
+        ],
+        cwd='/usr/src/paperless/src',
+        check=False,
+    )
+
+    duration = time.monotonic() - start
+    success = result.returncode == 0
+    changed_files = count_changed_files(since_ns, exported_before) if success else 0
+    print(f'Export finished after {duration:.0f}s, {changed_files} files changed.')
+
+    if endpoint := os.environ.get('OTEL_EXPORTER_OTLP_ENDPOINT'):
+        try:
+            push_metrics(
+                endpoint,
+                {
+                    'paperless.export.duration': ('s', duration),
+                    'paperless.export.changed_files': ('', changed_files),
+                    'paperless.export.success': ('', float(success)),
+                },
+            )
+        except (urllib.error.URLError, TimeoutError) as e:
+            print(f'Failed to push export metrics: {e}', file=sys.stderr)
+
+    return result.returncode
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,12 +2,122 @@
 mkdir -p {{ rclone_config_dir_write }}
 cat {{ rclone_config_dir_readonly }}/{{ rclone_config_file_name }} > {{ rclone_config_dir_write }}/{{ rclone_config_file_name }}
 
-while true; do
-  echo *********************************************************************************************
-  set -x
-{%- for destination in destinations %}
-  rclone sync {{ rclone_media_mount }}/documents/originals {{ destination }} --config {{ rclone_config_dir_write }}/{{ rclone_config_file_name }} -v
-{%- endfor %}
-  set +x
-  sleep {{ sync_period_sec }}
+source={{ rclone_media_mount }}/documents/originals
+# state is kept in the container, a restart starts with a full sync:
+state_dir={{ rclone_config_dir_write }}/state
+status_dir={{ rclone_config_dir_write }}/status
+mkdir -p "$state_dir" "$status_dir"
+
+# the remote control API is only reachable locally, metrics and destination status are exposed:
+rclone rcd \
+  --rc-addr 127.0.0.1:5572 --rc-no-auth \
+  --metrics-addr :{{ rclone_metrics_port }} \
+  --config {{ rclone_config_dir_write }}/{{ rclone_config_file_name }} \
+  --transfers {{ transfers }} --checkers {{ checkers }}{% if bwlimit %} --bwlimit "{{ bwlimit }}"{% endif %} -v &
+rcd_pid=$!
+rclone serve http "$status_dir" --addr :{{ rclone_status_port }} --read-only &
+
+rc() {
+  rclone rc --url http://127.0.0.1:5572/ "$@"
+}
+
+until rc core/version > /dev/null 2>&1; do
+  sleep 1
 done
+
+# run an rclone job in the daemon and wait for it, stopping it after the destination timeout:
+run_job() {
+  job_id=$(rc "$@" _async=true | sed -n 's/.*"jobid": *\([0-9]*\).*/\1/p')
+  [ -n "$job_id" ] || return 1
+  deadline=$(($(date +%s) + {{ destination_timeout_sec }}))
+
+  while sleep 5; do
+    status=$(rc job/status jobid="$job_id") || return 1
+    if echo "$status" | grep -q '"finished": true'; then
+      echo "$status" | grep -q '"success": true'
+      return
+    fi
+    if [ "$(date +%s)" -ge "$deadline" ]; then
+      echo "Job $job_id timed out, stopping it."
+      rc job/stop jobid="$job_id"
+      return 1
+    fi
+  done
+}
+
+# publish the status of all destinations, metric families are grouped by sorting:
+write_status() {
+  index=$1
+  destination=$2
+  success=$3
+  duration=$4
+  stats=$(rc core/stats group="destination-$index")
+  # the stats are empty if the daemon did not answer, keep the exposition valid:
+  bytes=$(echo "$stats" | grep -m1 '"bytes":' | tr -dc 0-9)
+  errors=$(echo "$stats" | grep -m1 '"errors":' | tr -dc 0-9)
+  labels="destination=\"$destination\""
+
+  cat > "$state_dir/status-$index.tmp" <<EOF_STATUS
+rclone_destination_last_run_success{$labels} $success
+rclone_destination_last_run_duration_seconds{$labels} $duration
+rclone_destination_last_success_timestamp_seconds{$labels} $(cat "$state_dir/last-sync-$index" 2>/dev/null || echo 0)
+rclone_destination_last_full_sync_timestamp_seconds{$labels} $(cat "$state_dir/last-full-sync-$index" 2>/dev/null || echo 0)
+rclone_destination_transferred_bytes_total{$labels} ${bytes:-0}
+rclone_destination_errors_total{$labels} ${errors:-0}
+EOF_STATUS
+  mv "$state_dir/status-$index.tmp" "$state_dir/status-$index.prom"
+
+  # destinations write their status concurrently, each through its own temporary file:
+  sort "$state_dir"/status-*.prom > "$status_dir/destinations-$index.tmp"
+  mv "$status_dir/destinations-$index.tmp" "$status_dir/destinations.txt"
+}
+
+# sync a single destination in its own loop, so slow remotes do not delay the others:
+sync_destination() {
+  index=$1
+  destination=$2
+  last_sync_file=$state_dir/last-sync-$index
+  last_full_sync_file=$state_dir/last-full-sync-$index
+
+  while true; do
+    start=$(date +%s)
+    last_sync=$(cat "$last_sync_file" 2>/dev/null || echo 0)
+    last_full_sync=$(cat "$last_full_sync_file" 2>/dev/null || echo 0)
+    success=1
+
+    if [ $((start - last_full_sync)) -ge {{ full_sync_period_sec }} ]; then
+      echo "Full sync of $destination."
+      if run_job sync/sync srcFs="$source" dstFs="$destination" _group="destination-$index" \
+        _config='{"UseListR": {{ fast_list | lower }}}'; then
+        echo "$start" > "$last_full_sync_file"
+      else
+        success=0
+      fi
+    else
+      # only copy originals written since the last successful run, without listing the remote;
+      # paperless keeps the mtime of consumed files, but storing them sets a new ctime:
+      since=$((last_sync - {{ incremental_overlap_sec }}))
+      changed_files=$state_dir/changed-$index.txt
+      find "$source" -type f -exec stat -c '%Z %n' {} + \
+        | awk -v since="$since" -v prefix="$source/" \
+          '$1 >= since { sub(/^[0-9]+ /, ""); print substr($0, length(prefix) + 1) }' \
+        > "$changed_files" || success=0
+      echo "Incremental sync of $destination, $(wc -l < "$changed_files") files changed."
+      if [ "$success" = 1 ] && [ -s "$changed_files" ]; then
+        run_job sync/copy srcFs="$source" dstFs="$destination" _group="destination-$index" \
+          _config='{"NoTraverse": true}' _filter="{\"FilesFrom\": [\"$changed_files\"]}" \
+          || success=0
+      fi
+    fi
+
+    [ "$success" = 1 ] && echo "$start" > "$last_sync_file"
+    write_status "$index" "$destination" "$success" $(($(date +%s) - start))
+    sleep {{ sync_period_sec }}
+  done
+}
+{% for destination in destinations %}
+sync_destination {{ loop.index0 }} "{{ destination }}" &
+{%- endfor %}
+
+# restart the container if the daemon fails:
+wait "$rcd_pid"
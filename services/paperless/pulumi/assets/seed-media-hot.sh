@@ -0,0 +1,74 @@
+#!/bin/sh
+# Seed the hot media tier from the copies on the SMB media share, then regenerate the files which
+# are missing or outdated there, as the share copies are hidden since the hot tier took over.
+# Remove the `.seeded-<directory>` markers of the hot volume to rebuild a directory again.
+#
+# Usage: seed-media-hot.sh copy|regenerate <directory>...
+set -eu
+
+step=$1
+shift
+cold=/mnt/cold/documents
+hot=/mnt/hot
+
+if [ "$step" = copy ]; then
+  for directory in "$@"; do
+    if [ ! -e "$hot/.seeded-$directory" ] && [ ! -e "$hot/.copied-$directory" ]; then
+      echo "Copying $directory from the media share."
+      mkdir -p "$hot/$directory"
+      if [ -d "$cold/$directory" ]; then
+        cp -R -p "$cold/$directory/." "$hot/$directory/"
+      fi
+      touch "$hot/.copied-$directory"
+    fi
+  done
+  exit 0
+fi
+
+copied=''
+for directory in "$@"; do
+  if [ -e "$hot/.copied-$directory" ]; then
+    copied="$copied $directory"
+  fi
+done
+
+if [ -z "$copied" ]; then
+  exit 0
+fi
+
+cd /usr/src/paperless/src
+# the image entrypoint is skipped, bring the schema to the version of the image first:
+python3 manage.py migrate --no-input
+HOT_MEDIA_DIRECTORIES="$copied" python3 manage.py shell <<'EOF'
+import hashlib
+import os
+
+from django.core.management import call_command
+from documents.models import Document
+
+directories = os.environ['HOT_MEDIA_DIRECTORIES'].split()
+
+
+def is_archive_current(document):
+    path = document.archive_path
+    if not path or not path.is_file():
+        return False
+    with path.open('rb') as f:
+        return hashlib.file_digest(f, 'md5').hexdigest() == document.archive_checksum
+
+
+for document in Document.objects.order_by('pk').iterator():
+    # thumbnails carry no checksum, they are only regenerated if missing:
+    if 'thumbnails' in directories and not document.thumbnail_path.is_file():
+        print(f'Regenerating thumbnail of document {document.pk}.')
+        call_command('document_thumbnails', document=document.pk)
+    if 'archive' in directories and document.has_archive_version and not is_archive_current(document):
+        print(f'Regenerating archived version of document {document.pk}.')
+        call_command('document_archiver', document=document.pk, overwrite=True)
+EOF
+
+# only mark directories as seeded once complete, an interrupted run regenerates again:
+for directory in $copied; do
+  mv "$hot/.copied-$directory" "$hot/.seeded-$directory"
+done
+echo "Seeded$copied."
@@ -0,0 +1,50 @@
+#!/bin/sh
+# Import the SQLite database of paperless into the configured PostgreSQL database, see
+# https://docs.djangoproject.com/en/stable/ref/django-admin/#dumpdata.
+set -eu
+
+sqlite_db=/usr/src/paperless/data/db.sqlite3
+dump=/usr/src/paperless/data/sqlite-dump.json
+
+if [ ! -f "$sqlite_db" ]; then
+  echo "No SQLite database found, nothing to migrate."
+  exit 0
+fi
+
+# paperless never ran against an empty or schema-less database, e.g. on a fresh stack:
+if ! python3 - "$sqlite_db" <<'EOF'
+import sqlite3
+import sys
+
+db = sqlite3.connect(f'file:{sys.argv[1]}?mode=ro', uri=True)
+query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'documents_document'"
+sys.exit(0 if db.execute(query).fetchone() else 1)
+EOF
+then
+  echo "SQLite database has no paperless schema, nothing to migrate."
+  exit 0
+fi
+
+cd /usr/src/paperless/src
+
+# paperless falls back to SQLite without a database host, bring its schema to the version of the
+# image before dumping:
+PAPERLESS_DBHOST='' python3 manage.py migrate --no-input
+PAPERLESS_DBHOST='' python3 manage.py dumpdata \
+  --natural-foreign --natural-primary \
+  --exclude contenttypes --exclude auth.permission --exclude admin.logentry --exclude sessions \
+  --output "$dump"
+
+python3 manage.py migrate --no-input
+
+if ! python3 manage.py shell -c "import sys; from documents.models import Document; sys.exit(Document.objects.exists())"; then
+  echo "PostgreSQL database already contains documents, not importing $dump." >&2
+  exit 1
+fi
+
+python3 manage.py loaddata "$dump"
+
+# keep the SQLite database for a manual rollback, but never import it again:
+mv "$sqlite_db" "$sqlite_db.migrated"
+rm "$dump"
+echo "Migrated SQLite database to PostgreSQL."
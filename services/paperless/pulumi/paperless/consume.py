@@ -0,0 +1,82 @@
+"""Local consume inbox fed from the SMB consume share."""
+
+import pulumi as p
+import pulumi_kubernetes as k8s
+
+from paperless.model import ComponentConfig
+
+INBOX_CLAIM_NAME = 'consume-inbox'
+SMB_CONSUME_MOUNT = '/mnt/smb-consume'
+INBOX_MOUNT = '/mnt/inbox'
+
+
+def create_consume_inbox_sidecar(
+    component_config: ComponentConfig,
+    k8s_opts: p.ResourceOptions,
+) -> tuple[
+    list[k8s.core.v1.ContainerArgsDict],
+    list[k8s.core.v1.VolumeArgsDict],
+]:
+    consume_config = component_config.paperless.consume
+    assert consume_config.mode == 'inbox', 'only called for the inbox mode'
+
+    # node local volume supporting inotify, shared with the workers on the same node:
+    inbox = k8s.core.v1.PersistentVolumeClaim(
+        'consume-inbox',
+        metadata={'name': INBOX_CLAIM_NAME},
+        spec={
+            'storage_class_name': 'data-hostpath',
+            'access_modes': ['ReadWriteOnce'],
+            'resources': {'requests': {'storage': f'{consume_config.inbox_size_mb}Mi'}},
+        },
+        opts=k8s_opts,
+    )
+
+    volumes = [
+        k8s.core.v1.VolumeArgsDict(
+            name='inbox',
+            persistent_volume_claim={'claim_name': inbox.metadata.name},
+        ),
+    ]
+
+    # rclone moves completely written files only and keeps the folder structure for tags, it
+    # writes to temporary names, so inotify reports each file once it is complete:
+    move_command = ' '.join((
+        'rclone move',
+        SMB_CONSUME_MOUNT,
+        INBOX_MOUNT,
+        f'--min-age {consume_config.settle_time_sec}s',
+        "--exclude '.*'",
+        '--transfers 4',
+        '-v',
+    ))
+
+    init_containers = [
+        k8s.core.v1.ContainerArgsDict(
+            name='consume-inbox',
+            image=f'rclone/rclone:{consume_config.rclone_version}',
+            restart_policy='Always',
+            # run as the paperless user, so the consumer can delete consumed files:
+            security_context={
+                'run_as_user': 1000,
+                'run_as_group': 1000,
+            },
+            volume_mounts=[
+                {
+                    'name': 'consume',
+                    'mount_path': SMB_CONSUME_MOUNT,
+                },
+                {
+                    'name': 'inbox',
+                    'mount_path': INBOX_MOUNT,
+                },
+            ],
+            command=[
+                '/bin/sh',
+                '-c',
+                f'while true; do {move_command}; sleep {consume_config.polling_interval_sec}; done',
+            ],
+        )
+    ]
+
+    return init_containers, volumes
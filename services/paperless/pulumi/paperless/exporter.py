@@ -0,0 +1,164 @@
+"""Scheduled document export of paperless to the export share."""
+
+import pathlib
+
+import pulumi as p
+import pulumi_kubernetes as k8s
+
+from utils.instances import split_stack_name
+
+from paperless.media import get_media_volume_mounts
+from paperless.model import ComponentConfig
+
+
+def create_exporter(
+    component_config: ComponentConfig,
+    config: k8s.core.v1.ConfigMap,
+    config_secret: k8s.core.v1.Secret,
+    paperless_sts: k8s.apps.v1.StatefulSet,
+    hot_media_volumes: list[k8s.core.v1.VolumeArgsDict],
+    k8s_opts: p.ResourceOptions,
+) -> k8s.batch.v1.CronJob:
+    paperless_config = component_config.paperless
+    pod_mode = paperless_config.exporter_mode == 'pod'
+
+    pod_spec = (
+        _get_export_pod_spec(
+            component_config, config, config_secret, paperless_sts, hot_media_volumes, k8s_opts
+        )
+        if pod_mode
+        else _get_exec_pod_spec(component_config, paperless_sts)
+    )
+
+    return k8s.batch.v1.CronJob(
+        'exporter',
+        metadata={'name': 'exporter'},
+        spec={
+            'schedule': paperless_config.exporter_schedule,
+            # overlapping exports would compete for the export share:
+            'concurrency_policy': 'Forbid' if pod_mode else 'Allow',
+            'successful_jobs_history_limit': 3,
+            'job_template': {
+                'spec': {
+                    'template': {
+                        'spec': pod_spec,
+                    }
+                },
+            },
+        },
+        opts=k8s_opts,
+    )
+
+
+def _get_exec_pod_spec(
+    component_config: ComponentConfig,
+    paperless_sts: k8s.apps.v1.StatefulSet,
+) -> k8s.core.v1.PodSpecArgsDict:
+    kubectl_args = p.Output.concat(
+        'exec statefulset/',
+        paperless_sts.metadata.name,
+        ' -c webserver -- '
+        'document_exporter ../export --delete --use-filename-format --use-folder-prefix --no-progress-bar',
+    )
+
+    return {
+        'containers': [
+            {
+                'name': 'exporter',
+                'image': f'registry.k8s.io/kubectl:{component_config.paperless.exporter_kubectl_version}',
+                'args': kubectl_args.apply(lambda a: a.split(' ')),
+            }
+        ],
+        'restart_policy': 'Never',
+    }
+
+
+def _get_export_pod_spec(
+    component_config: ComponentConfig,
+    config: k8s.core.v1.ConfigMap,
+    config_secret: k8s.core.v1.Secret,
+    paperless_sts: k8s.apps.v1.StatefulSet,
+    hot_media_volumes: list[k8s.core.v1.VolumeArgsDict],
+    k8s_opts: p.ResourceOptions,
+) -> k8s.core.v1.PodSpecArgsDict:
+    script_name = 'paperless-export.py'
+    script = k8s.core.v1.ConfigMap(
+        script_name,
+        data={script_name: pathlib.Path(f'assets/{script_name}').read_text()},
+        opts=k8s_opts,
+    )
+
+    env: list[k8s.core.v1.EnvVarArgsDict] = []
+    if component_config.paperless.exporter_metrics:
+        base_stack, _ = split_stack_name()
+        observability_stack = p.StackReference(f'{p.get_organization()}/observability/{base_stack}')
+        env = [
+            {
+                'name': 'NAMESPACE',
+                'value_from': {'field_ref': {'field_path': 'metadata.namespace'}},
+            },
+            {
+                'name': 'OTEL_EXPORTER_OTLP_ENDPOINT',
+                'value': observability_stack.get_output('alloy-otlp-http-endpoint'),
+            },
+            {
+                'name': 'OTEL_RESOURCE_ATTRIBUTES',
+                'value': 'service.name=paperless-exporter,service.instance.id=$(NAMESPACE)',
+            },
+        ]
+
+    # share the volumes of the single StatefulSet replica, the data volume is node local:
+    sts_name = paperless_sts.metadata.name
+    volumes: list[k8s.core.v1.VolumeArgsDict] = [
+        {
+            'name': volume,
+            'persistent_volume_claim': {
+                'claim_name': p.Output.format('{}-{}-0', volume, sts_name),
+            },
+        }
+        for volume in ('data', 'media', 'export')
+    ]
+
+    return {
+        'affinity': {
+            'pod_affinity': {
+                'required_during_scheduling_ignored_during_execution': [
+                    {
+                        'label_selector': {
+                            'match_labels': paperless_sts.spec.selector.match_labels,
+                        },
+                        'topology_key': 'kubernetes.io/hostname',
+                    }
+                ],
+            },
+        },
+        # user of the paperless image, owning the volumes:
+        'security_context': {
+            'run_as_user': 1000,
+            'run_as_group': 1000,
+        },
+        'containers': [
+            {
+                'name': 'exporter',
+                'image': f'ghcr.io/paperless-ngx/paperless-ngx:{component_config.paperless.version}',
+                'command': ['python3', f'/scripts/{script_name}'],
+                'env_from': [
+                    {'config_map_ref': {'name': config.metadata.name}},
+                    {'secret_ref': {'name': config_secret.metadata.name}},
+                ],
+                'env': env,
+                'volume_mounts': [
+                    {'name': 'data', 'mount_path': '/usr/src/paperless/data'},
+                    *get_media_volume_mounts(component_config),
+                    {'name': 'export', 'mount_path': '/usr/src/paperless/export'},
+                    {'name': 'script', 'mount_path': '/scripts', 'read_only': True},
+                ],
+            }
+        ],
+        'volumes': [
+            *volumes,
+            *hot_media_volumes,
+            {'name': 'script', 'config_map': {'name': script.metadata.name}},
+        ],
+        'restart_policy': 'Never',
+    }
@@ -0,0 +1,139 @@
+"""Media volumes of paperless, optionally with generated files on a local hot tier.
+
+Paperless derives the originals, archive and thumbnail directories from its media root, so the hot
+tier is mounted over the generated directories of the SMB media share.
+"""
+
+import pathlib
+
+import pulumi as p
+import pulumi_kubernetes as k8s
+
+from paperless.model import ComponentConfig
+
+MEDIA_MOUNT = '/usr/src/paperless/media'
+
+
+def get_media_volume_mounts(
+    component_config: ComponentConfig,
+) -> list[k8s.core.v1.VolumeMountArgsDict]:
+    """Volume mounts of the media directory for all containers running paperless."""
+    volume_mounts: list[k8s.core.v1.VolumeMountArgsDict] = [
+        {'name': 'media', 'mount_path': MEDIA_MOUNT},
+    ]
+    if hot_media := component_config.paperless.hot_media:
+        volume_mounts.extend(
+            {
+                'name': 'media-hot',
+                'mount_path': f'{MEDIA_MOUNT}/documents/{directory}',
+                'sub_path': directory,
+            }
+            for directory in hot_media.directories
+        )
+    return volume_mounts
+
+
+def create_hot_media_volumes(
+    component_config: ComponentConfig,
+    k8s_opts: p.ResourceOptions,
+) -> list[k8s.core.v1.VolumeArgsDict]:
+    """Volumes of the hot tier for all pods running paperless, empty if not configured."""
+    if not (hot_media := component_config.paperless.hot_media):
+        return []
+
+    # shared with workers and exporter, which are scheduled on the same node:
+    pvc = k8s.core.v1.PersistentVolumeClaim(
+        'media-hot',
+        metadata={'name': 'media-hot'},
+        spec={
+            'storage_class_name': hot_media.storage_class_name,
+            'access_modes': ['ReadWriteOnce'],
+            'resources': {'requests': {'storage': f'{hot_media.size_gb}Gi'}},
+        },
+        opts=k8s_opts,
+    )
+    return [{'name': 'media-hot', 'persistent_volume_claim': {'claim_name': pvc.metadata.name}}]
+
+
+def create_hot_media_seed(
+    component_config: ComponentConfig,
+    config: k8s.core.v1.ConfigMap,
+    config_secret: k8s.core.v1.Secret,
+    k8s_opts: p.ResourceOptions,
+) -> tuple[
+    list[k8s.core.v1.ContainerArgsDict],
+    list[k8s.core.v1.VolumeArgsDict],
+]:
+    hot_media = component_config.paperless.hot_media
+    assert hot_media, 'only called if configured'
+
+    script_name = 'seed-media-hot.sh'
+    script = k8s.core.v1.ConfigMap(
+        script_name,
+        data={script_name: pathlib.Path(f'assets/{script_name}').read_text()},
+        opts=k8s_opts,
+    )
+
+    volumes = [
+        k8s.core.v1.VolumeArgsDict(
+            name='seed-media-hot',
+            config_map={'name': script.metadata.name},
+        ),
+    ]
+
+    image = f'ghcr.io/paperless-ngx/paperless-ngx:{component_config.paperless.version}'
+    # user of the paperless image, owning the media files:
+    security_context: k8s.core.v1.SecurityContextArgsDict = {
+        'run_as_user': 1000,
+        'run_as_group': 1000,
+    }
+    script_mount: k8s.core.v1.VolumeMountArgsDict = {
+        'name': 'seed-media-hot',
+        'mount_path': '/scripts',
+        'read_only': True,
+    }
+
+    init_containers = [
+        # copy the generated files from the share, which keeps the now hidden copies:
+        k8s.core.v1.ContainerArgsDict(
+            name='seed-media-hot',
+            image=image,
+            security_context=security_context,
+            command=['/bin/sh', f'/scripts/{script_name}', 'copy', *hot_media.directories],
+            volume_mounts=[
+                {
+                    'name': 'media',
+                    'mount_path': '/mnt/cold',
+                    'read_only': True,
+                },
+                {
+                    'name': 'media-hot',
+                    'mount_path': '/mnt/hot',
+                },
+                script_mount,
+            ],
+        ),
+        # the copies miss files generated since the hot tier took over, regenerate those with the
+        # final media layout:
+        k8s.core.v1.ContainerArgsDict(
+            name='regenerate-media-hot',
+            image=image,
+            security_context=security_context,
+            command=['/bin/sh', f'/scripts/{script_name}', 'regenerate', *hot_media.directories],
+            env_from=[
+                {'config_map_ref': {'name': config.metadata.name}},
+                {'secret_ref': {'name': config_secret.metadata.name}},
+            ],
+            volume_mounts=[
+                {'name': 'data', 'mount_path': '/usr/src/paperless/data'},
+                *get_media_volume_mounts(component_config),
+                {
+                    'name': 'media-hot',
+                    'mount_path': '/mnt/hot',
+                },
+                script_mount,
+            ],
+        ),
+    ]
+
+    return init_containers, volumes
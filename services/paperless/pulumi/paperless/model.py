@@ -1,8 +1,17 @@
 """Configuration model."""
 
+import math
+import typing as t
+
 import pydantic
 
-from utils.model import ConfigBaseModel, EnvVarRef, get_pulumi_project
+from utils.model import (
+    ConfigBaseModel,
+    EnvVarRef,
+    IngressMiddlewaresConfig,
+    ResourcesConfig,
+    get_pulumi_project,
+)
 
 
 class SmtpConfig(ConfigBaseModel):
@@ -14,17 +23,151 @@ class SmtpConfig(ConfigBaseModel):
     use_ssl: bool = True
 
 
+def get_cores(resources: ResourcesConfig) -> int:
+    return max(1, math.floor(resources.cpus or 1))
+
+
+class PaperlessPerformanceConfig(ConfigBaseModel):
+    resources: ResourcesConfig = pydantic.Field(default_factory=ResourcesConfig)
+    """Resources of the container running the task workers, the CPUs determine the default
+    concurrency."""
+
+    task_workers: pydantic.PositiveInt | None = None
+    """Documents consumed in parallel, defaults to half of the CPUs."""
+
+    threads_per_worker: pydantic.PositiveInt | None = None
+    """OCR threads per task worker, defaults to the CPUs left per worker."""
+
+    webserver_workers: pydantic.PositiveInt | None = None
+    """Gunicorn workers serving the web UI and API, defaults to 2 with 4 or more CPUs of the web
+    server container."""
+
+    ocr_pages: pydantic.NonNegativeInt = 0
+    """Number of pages to OCR per document, `0` for all pages."""
+
+    ocr_mode: t.Literal['skip', 'redo', 'force'] = 'skip'
+    """Skip OCR for pages with text, redo OCR of all pages or force rasterizing."""
+
+    ocr_skip_archive_file: t.Literal['never', 'with_text', 'always'] = 'never'
+    """When to skip creating the archived PDF/A version of a document."""
+
+    @property
+    def cores(self) -> int:
+        return get_cores(self.resources)
+
+    def get_task_workers(self) -> int:
+        return self.task_workers or max(1, self.cores // 2)
+
+    def get_threads_per_worker(self) -> int:
+        return self.threads_per_worker or max(1, self.cores // self.get_task_workers())
+
+    def get_webserver_workers(self, web_resources: ResourcesConfig | None = None) -> int:
+        """Web server workers, sized by `web_resources` if the task workers run separately."""
+        cores = get_cores(web_resources) if web_resources is not None else self.cores
+        return self.webserver_workers or (2 if cores >= 4 else 1)
+
+
+class ConsumeConfig(ConfigBaseModel):
+    mode: t.Literal['polling', 'inbox'] = 'polling'
+    """`polling` lets paperless poll the SMB share, as inotify does not work on CIFS mounts,
+    `inbox` moves files from the share into a local inbox which paperless watches with inotify."""
+
+    polling_interval_sec: pydantic.PositiveInt = 30
+    """Interval of scanning the SMB share, by paperless or by the inbox sidecar."""
+
+    settle_time_sec: pydantic.PositiveInt = 5
+    """Minimum age of files moved to the inbox, skipping files still being written."""
+
+    inbox_size_mb: pydantic.PositiveInt = 512
+
+    rclone_version: str | None = None
+    """Tag of the `rclone/rclone` image of the inbox sidecar."""
+
+    @pydantic.model_validator(mode='after')
+    def _check_rclone_version(self) -> t.Self:
+        if self.mode == 'inbox' and not self.rclone_version:
+            raise ValueError('Consume inbox mode requires the rclone-version.')
+        return self
+
+
+class HotMediaConfig(ConfigBaseModel):
+    """Local storage for generated media, while the originals stay on the SMB media share."""
+
+    size_gb: pydantic.PositiveInt
+    storage_class_name: str = 'data-hostpath'
+    """Node local storage class, its content can be rebuilt from the originals."""
+    directories: list[t.Literal['thumbnails', 'archive']] = ['thumbnails', 'archive']
+    """Directories below `media/documents` moved to the local storage, seeded from the share with
+    missing or outdated files regenerated. Delete the `.seeded-<directory>` marker on the volume
+    to rebuild a directory, a lost volume is rebuilt on the next start of paperless."""
+
+
+class PaperlessWorkerAutoscalingConfig(ConfigBaseModel):
+    """Scale workers on the length of the Celery queue in Redis, requires the KEDA operator."""
+
+    min_replicas: pydantic.NonNegativeInt = 1
+    max_replicas: pydantic.PositiveInt = 4
+    queue_length: pydantic.PositiveInt = 5
+    """Queued tasks per worker replica."""
+    polling_interval_sec: pydantic.PositiveInt = 30
+    cooldown_period_sec: pydantic.PositiveInt = 300
+
+    @pydantic.model_validator(mode='after')
+    def _check_replicas(self) -> t.Self:
+        if self.min_replicas > self.max_replicas:
+            raise ValueError('Autoscaling min-replicas must not exceed max-replicas.')
+        return self
+
+
+class PaperlessWorkersConfig(ConfigBaseModel):
+    """Celery workers running in their own deployment next to the web server."""
+
+    replicas: pydantic.PositiveInt = 1
+    """Worker replicas if not autoscaled."""
+
+    autoscaling: PaperlessWorkerAutoscalingConfig | None = None
+
+    web_resources: ResourcesConfig = pydantic.Field(default_factory=ResourcesConfig)
+    """Resources of the web server container, the workers use the performance resources."""
+
+
 class PaperlessConfig(ConfigBaseModel):
     version: str
     port: pydantic.PositiveInt = 8000
     data_size_gb: pydantic.PositiveInt
     media_size_gb: pydantic.PositiveInt
     consume_size_mb: pydantic.PositiveInt
+    consume: ConsumeConfig = pydantic.Field(default_factory=ConsumeConfig)
     export_size_gb: pydantic.PositiveInt
     exporter_kubectl_version: str
     exporter_schedule: str = '30 3 * * *'
+    exporter_mode: t.Literal['exec', 'pod'] = 'exec'
+    """`exec` runs the exporter in the web server container via kubectl, `pod` in a dedicated pod
+    sharing the volumes, which compares checksums and manifests to only write changed files."""
+    exporter_metrics: bool = False
+    """Push duration and changed files of `pod` exports to the OTLP endpoint of the observability
+    stack."""
     external_hostname: str | None = None
     smtp: SmtpConfig | None = None
+    ingress_middlewares: IngressMiddlewaresConfig = pydantic.Field(
+        default_factory=IngressMiddlewaresConfig
+    )
+    """Traefik middlewares of the ingress route, not used if tunneled."""
+    performance: PaperlessPerformanceConfig = pydantic.Field(
+        default_factory=PaperlessPerformanceConfig
+    )
+    """Task worker, OCR and web server concurrency with the matching container resources."""
+    workers: PaperlessWorkersConfig | None = None
+    """Run the task workers in a separate deployment instead of the web server container, which then
+    only runs the web server next to own consumer and scheduler containers."""
+    hot_media: HotMediaConfig | None = None
+    """Serve thumbnails and archived documents from local storage instead of the SMB share."""
+
+    @pydantic.model_validator(mode='after')
+    def _check_exporter_metrics(self) -> t.Self:
+        if self.exporter_metrics and self.exporter_mode != 'pod':
+            raise ValueError('Exporter metrics require the pod exporter mode.')
+        return self
 
 
 class RedisConfig(ConfigBaseModel):
@@ -32,17 +175,58 @@ class RedisConfig(ConfigBaseModel):
     port: pydantic.PositiveInt = 6379
 
 
+class PgBouncerConfig(ConfigBaseModel):
+    version: str
+    """Tag of the `edoburu/pgbouncer` image."""
+    default_pool_size: pydantic.PositiveInt = 20
+    """Server connections per database and user."""
+    max_client_conn: pydantic.PositiveInt = 200
+
+
+class PostgresConfig(ConfigBaseModel):
+    version: str
+    """Tag of the `postgres` image."""
+    size_gb: pydantic.PositiveInt = 4
+    shared_buffers: str = '128MB'
+    work_mem: str = '4MB'
+    effective_cache_size: str = '512MB'
+    max_connections: pydantic.PositiveInt = 100
+    resources: ResourcesConfig = pydantic.Field(default_factory=ResourcesConfig)
+    pgbouncer: PgBouncerConfig | None = None
+    """Pool the connections of web server and workers, paperless connects to PgBouncer if set."""
+    migrate_from_sqlite: bool = False
+    """Import the existing SQLite database of the data volume before switching to PostgreSQL, done
+    by an init container of the restarted paperless pod. Separate workers switch afterwards, so
+    migrate with an empty task queue. The pod does not start while PostgreSQL already holds
+    documents and an unmigrated SQLite database exists."""
+
+
 class RCloneConfig(ConfigBaseModel):
     version: str
     rclone_conf_b64: EnvVarRef
     """Base64 encoded rclone config file, including remote and refresh token."""
     sync_period_sec: pydantic.PositiveInt = 600
+    """Period of the incremental sync, copying originals with a ctime after the last successful run,
+    as paperless keeps the mtime of consumed files."""
+    full_sync_period_sec: pydantic.PositiveInt = 24 * 60 * 60
+    """Period of the full reconciliation, which also propagates deletions and renames."""
+    incremental_overlap_sec: pydantic.NonNegativeInt = 300
+    """Extend the incremental window into the previous run to cover clock skew of the share."""
+    transfers: pydantic.PositiveInt = 4
+    checkers: pydantic.PositiveInt = 8
+    fast_list: bool = False
+    """List the remote recursively in few requests during full syncs, uses more memory."""
+    bwlimit: str | None = None
+    """Bandwidth limit or timetable, e.g. `4M` or `08:00,1M 23:00,off`."""
+    destination_timeout_sec: pydantic.PositiveInt = 60 * 60
+    """Stop a sync of a single destination after this time, destinations are synced concurrently."""
     destinations: list[str]
 
 
 class ComponentConfig(ConfigBaseModel):
     paperless: PaperlessConfig
     redis: RedisConfig
+    postgres: PostgresConfig | None = None
     rclone: RCloneConfig | None = None
 
 
@@ -6,7 +6,14 @@ import pulumi as p
 import pulumi_kubernetes as k8s
 import pulumi_random as random
 
+from utils.traefik import create_ingress_route
+
+from paperless.consume import create_consume_inbox_sidecar
+from paperless.exporter import create_exporter
+from paperless.media import create_hot_media_seed, create_hot_media_volumes, get_media_volume_mounts
 from paperless.model import ComponentConfig
+from paperless.postgres import create_database, create_sqlite_migration
+from paperless.workers import create_workers
 
 LABELS = {'app': 'paperless'}
 
@@ -23,15 +30,48 @@ def create_paperless(
 ):
     k8s_opts = p.ResourceOptions(provider=namespaced_provider)
 
-    config, config_secret = create_configurations(component_config, fqdn, k8s_opts)
+    broker = create_broker(component_config, k8s_opts)
+
+    database_config, database_secret = (
+        create_database(component_config, k8s_opts) if component_config.postgres else ({}, {})
+    )
+
+    config, config_secret = create_configurations(
+        component_config, fqdn, broker, database_config, database_secret, k8s_opts
+    )
 
     sidecar_containers = []
     sidecar_volumes = []
 
-    if component_config.rclone:
-        sidecar_containers, sidecar_volumes = create_rclone_originals_sidecar(
-            component_config, k8s_opts
+    if component_config.postgres and component_config.postgres.migrate_from_sqlite:
+        # the web server starts on PostgreSQL only after the import succeeded, the replaced pod
+        # running on SQLite is stopped before:
+        containers, volumes = create_sqlite_migration(
+            component_config, config, config_secret, k8s_opts
+        )
+        sidecar_containers.extend(containers)
+        sidecar_volumes.extend(volumes)
+
+    hot_media_volumes = create_hot_media_volumes(component_config, k8s_opts)
+    sidecar_volumes.extend(hot_media_volumes)
+
+    if component_config.paperless.hot_media:
+        # regular init containers, completed before the sidecars start:
+        containers, volumes = create_hot_media_seed(
+            component_config, config, config_secret, k8s_opts
         )
+        sidecar_containers.extend(containers)
+        sidecar_volumes.extend(volumes)
+
+    if component_config.rclone:
+        containers, volumes = create_rclone_originals_sidecar(component_config, k8s_opts)
+        sidecar_containers.extend(containers)
+        sidecar_volumes.extend(volumes)
+
+    if component_config.paperless.consume.mode == 'inbox':
+        containers, volumes = create_consume_inbox_sidecar(component_config, k8s_opts)
+        sidecar_containers.extend(containers)
+        sidecar_volumes.extend(volumes)
 
     paperless_sts = create_application_sts(
         component_config,
@@ -42,12 +82,91 @@ def create_paperless(
         k8s_opts,
     )
 
-    create_service(fqdn if not tunneled else None, paperless_sts, k8s_opts)
+    create_exporter(
+        component_config, config, config_secret, paperless_sts, hot_media_volumes, k8s_opts
+    )
+
+    if component_config.paperless.workers:
+        create_workers(
+            component_config,
+            config,
+            config_secret,
+            broker,
+            paperless_sts,
+            hot_media_volumes,
+            k8s_opts,
+        )
+
+    create_service(
+        fqdn if not tunneled else None,
+        paperless_sts,
+        component_config.paperless.ingress_middlewares,
+        k8s_opts,
+    )
+
+
+def create_broker(
+    component_config: ComponentConfig,
+    k8s_opts: p.ResourceOptions,
+) -> k8s.core.v1.Service:
+    # the broker is not persisted, tasks queued but not yet started are lost on restart, files left
+    # in the consume directory are picked up again once the consumer restarts:
+    labels = {'app': 'redis'}
+    k8s.apps.v1.Deployment(
+        'redis',
+        metadata={'name': 'redis'},
+        spec={
+            'replicas': 1,
+            'selector': {'match_labels': labels},
+            'template': {
+                'metadata': {'labels': labels},
+                'spec': {
+                    'containers': [
+                        {
+                            'name': 'redis',
+                            'image': f'docker.io/library/redis:{component_config.redis.version}',
+                            'ports': [
+                                {
+                                    'name': 'redis',
+                                    'container_port': component_config.redis.port,
+                                },
+                            ],
+                            'readiness_probe': {
+                                'exec_': {
+                                    'command': ['redis-cli', 'ping'],
+                                },
+                            },
+                        },
+                    ],
+                },
+            },
+        },
+        opts=k8s_opts,
+    )
+
+    return k8s.core.v1.Service(
+        'redis',
+        metadata={'name': 'redis'},
+        spec={
+            'selector': labels,
+            'ports': [
+                {
+                    'name': 'redis',
+                    'port': component_config.redis.port,
+                    'target_port': 'redis',
+                },
+            ],
+        },
+        opts=k8s_opts,
+    )
 
 
 def create_configurations(
     component_config: ComponentConfig,
     fqdn: p.Input[str],
+    broker: k8s.core.v1.Service,
+    database_config: dict[str, p.Input[str]],
+    database_secret: dict[str, p.Input[str]],
     k8s_opts: p.ResourceOptions,
 ):
     admin_username = 'admin'
@@ -69,15 +188,41 @@ def create_configurations(
     else:
         smtp_data = {}
 
+    performance = component_config.paperless.performance
+    workers = component_config.paperless.workers
+    performance_data = {
+        'PAPERLESS_TASK_WORKERS': str(performance.get_task_workers()),
+        'PAPERLESS_THREADS_PER_WORKER': str(performance.get_threads_per_worker()),
+        'PAPERLESS_WEBSERVER_WORKERS': str(
+            performance.get_webserver_workers(workers.web_resources if workers else None)
+        ),
+        'PAPERLESS_OCR_PAGES': str(performance.ocr_pages),
+        'PAPERLESS_OCR_MODE': performance.ocr_mode,
+        'PAPERLESS_OCR_SKIP_ARCHIVE_FILE': performance.ocr_skip_archive_file,
+    }
+
+    if workers:
+        # uploaded files are handed over to the workers via the scratch directory:
+        workers_data = {'PAPERLESS_SCRATCH_DIR': '/usr/src/paperless/data/scratch'}
+    else:
+        workers_data = {}
+
     config = k8s.core.v1.ConfigMap(
         'config',
         data={
-            'PAPERLESS_REDIS': f'redis://localhost:{component_config.redis.port}',
+            'PAPERLESS_REDIS': p.Output.format(
+                'redis://{}:{}', broker.metadata.name, component_config.redis.port
+            ),
             'PAPERLESS_URL': p.Output.concat('https://', fqdn),
             'PAPERLESS_PORT': str(component_config.paperless.port),
             'PAPERLESS_ADMIN_USER': admin_username,
             'PAPERLESS_APPS': ','.join(('allauth.socialaccount.providers.openid_connect',)),
-            'PAPERLESS_CONSUMER_POLLING': '30',
+            # inotify does not work on the SMB share, but on the local inbox:
+            'PAPERLESS_CONSUMER_POLLING': (
+                str(component_config.paperless.consume.polling_interval_sec)
+                if component_config.paperless.consume.mode == 'polling'
+                else '0'
+            ),
             'PAPERLESS_ACCOUNT_EMAIL_VERIFICATION': 'optional' if smtp else 'none',
             'PAPERLESS_ACCOUNT_ALLOW_SIGNUPS': 'false',
             'PAPERLESS_CONSUMER_RECURSIVE': 'true',
@@ -88,6 +233,9 @@ def create_configurations(
             # see https://docs.paperless-ngx.com/troubleshooting/#consumption-fails-with-ghostscript-pdfa-rendering-failed
             'PAPERLESS_OCR_USER_ARGS': '{"continue_on_soft_render_error": true}',
         }
+        | performance_data
+        | workers_data
+        | database_config
         | smtp_data,
         opts=k8s_opts,
     )
@@ -101,7 +249,8 @@ def create_configurations(
                 special=False,
             ).result,
             'PAPERLESS_ADMIN_PASSWORD': admin_password,
-        },
+        }
+        | database_secret,
         type='Opaque',
         opts=k8s_opts,
     )
@@ -124,6 +273,8 @@ def create_rclone_originals_sidecar(
     rclone_config_dir_write = '/config/rclone'
     rclone_media_mount = '/mnt/paperless/media'
     rclone_script_name = 'rclone-sync.sh'
+    rclone_metrics_port = 9250
+    rclone_status_port = 9251
 
     rclone_script = k8s.core.v1.ConfigMap(
         rclone_script_name,
@@ -138,6 +289,8 @@ def create_rclone_originals_sidecar(
                     'rclone_config_dir_readonly': rclone_config_dir_readonly,
                     'rclone_config_dir_write': rclone_config_dir_write,
                     'rclone_media_mount': rclone_media_mount,
+                    'rclone_metrics_port': rclone_metrics_port,
+                    'rclone_status_port': rclone_status_port,
                 }
             ),
         },
@@ -206,6 +359,11 @@ def create_rclone_originals_sidecar(
                 },
             ],
             command=['/bin/sh', '/scripts/rclone-sync.sh'],
+            # scraped by Alloy:
+            ports=[
+                {'name': 'rclone-metrics', 'container_port': rclone_metrics_port},
+                {'name': 'rclone-status', 'container_port': rclone_status_port},
+            ],
         )
     ]
 
@@ -220,7 +378,120 @@ def create_application_sts(
     sidecar_volumes: list[k8s.core.v1.VolumeArgsDict],
     k8s_opts: p.ResourceOptions,
 ) -> k8s.apps.v1.StatefulSet:
-    sts = k8s.apps.v1.StatefulSet(
+    image = f'ghcr.io/paperless-ngx/paperless-ngx:{component_config.paperless.version}'
+    env_from: list[k8s.core.v1.EnvFromSourceArgsDict] = [
+        {
+            'config_map_ref': {
+                'name': config.metadata.name,
+            }
+        },
+        {
+            'secret_ref': {
+                'name': config_secret.metadata.name,
+            }
+        },
+    ]
+    data_mount: k8s.core.v1.VolumeMountArgsDict = {
+        'name': 'data',
+        'mount_path': '/usr/src/paperless/data',
+    }
+    # the SMB consume share is only mounted by the inbox sidecar in inbox mode:
+    consume_mount: k8s.core.v1.VolumeMountArgsDict = {
+        'name': 'inbox' if component_config.paperless.consume.mode == 'inbox' else 'consume',
+        'mount_path': '/usr/src/paperless/consume',
+    }
+
+    webserver_volume_mounts: list[k8s.core.v1.VolumeMountArgsDict] = [
+        data_mount,
+        *get_media_volume_mounts(component_config),
+        consume_mount,
+        {
+            'name': 'export',
+            'mount_path': '/usr/src/paperless/export',
+        },
+    ]
+    webserver: k8s.core.v1.ContainerArgsDict = {
+        'name': 'webserver',
+        'image': image,
+        'volume_mounts': webserver_volume_mounts,
+        'ports': [
+            {
+                'name': 'http',
+                'container_port': component_config.paperless.port,
+            },
+        ],
+        'env_from': env_from,
+        'readiness_probe': {
+            'http_get': {
+                'port': 'http',
+                'path': '/api/health',
+            }
+        },
+        'resources': component_config.paperless.performance.resources.to_k8s(),
+    }
+    containers = [webserver]
+    init_containers = list(sidecar_containers)
+
+    if workers := component_config.paperless.workers:
+        # the image entrypoint runs web server, Celery worker, scheduler and consumer together, run
+        # them as separate processes instead, so tasks are only executed by the worker deployment:
+        webserver_workers = component_config.paperless.performance.get_webserver_workers(
+            workers.web_resources
+        )
+        webserver |= get_process_container(
+            image,
+            env_from,
+            'webserver',
+            [
+                'granian',
+                '--interface',
+                'asginl',
+                '--ws',
+                '--host',
+                '::',
+                '--port',
+                str(component_config.paperless.port),
+                '--workers',
+                str(webserver_workers),
+                'paperless.asgi:application',
+            ],
+            webserver_volume_mounts,
+        )
+        webserver['resources'] = workers.web_resources.to_k8s()
+        containers = [
+            webserver,
+            # consumer and scheduler only hand tasks to the broker, without dedicated resources:
+            get_process_container(
+                image,
+                env_from,
+                'consumer',
+                ['python3', 'manage.py', 'document_consumer'],
+                [data_mount, *get_media_volume_mounts(component_config), consume_mount],
+            ),
+            get_process_container(
+                image,
+                env_from,
+                'scheduler',
+                ['celery', '--app', 'paperless', 'beat', '--loglevel', 'INFO'],
+                [data_mount],
+            ),
+        ]
+        # database preparation otherwise done by the entrypoint, before any process starts:
+        init_containers.append(
+            get_process_container(
+                image,
+                env_from,
+                'migrate',
+                [
+                    '/bin/sh',
+                    '-c',
+                    'python3 manage.py migrate --no-input && python3 manage.py manage_superuser',
+                ],
+                [data_mount],
+            )
+        )
+
+    return k8s.apps.v1.StatefulSet(
         'paperless',
         metadata={'name': 'paperless'},
         spec={
@@ -235,70 +506,8 @@ def create_application_sts(
                     'labels': LABELS,
                 },
                 'spec': {
-                    'containers': [
-                        {
-                            'name': 'webserver',
-                            'image': f'ghcr.io/paperless-ngx/paperless-ngx:{component_config.paperless.version}',
-                            'volume_mounts': [
-                                {
-                                    'name': 'data',
-                                    'mount_path': '/usr/src/paperless/data',
-                                },
-                                {
-                                    'name': 'media',
-                                    'mount_path': '/usr/src/paperless/media',
-                                },
-                                {
-                                    'name': 'consume',
-                                    'mount_path': '/usr/src/paperless/consume',
-                                },
-                                {
-                                    'name': 'export',
-                                    'mount_path': '/usr/src/paperless/export',
-                                },
-                            ],
-                            'ports': [
-                                {
-                                    'name': 'http',
-                                    'container_port': component_config.paperless.port,
-                                },
-                            ],
-                            'env_from': [
-                                {
-                                    'config_map_ref': {
-                                        'name': config.metadata.name,
-                                    }
-                                },
-                                {
-                                    'secret_ref': {
-                                        'name': config_secret.metadata.name,
-                                    }
-                                },
-                            ],
-                            'readiness_probe': {
-                                'http_get': {
-                                    'port': 'http',
-                                    'path': '/api/health',
-                                }
-                            },
-                        },
-                        {
-                            'name': 'broker',
-                            'image': f'docker.io/library/redis:{component_config.redis.version}',
-                            'ports': [
-                                {
-                                    'name': 'redis',
-                                    'container_port': component_config.redis.port,
-                                },
-                            ],
-                            'readiness_probe': {
-                                'exec_': {
-                                    'command': ['redis-cli', 'ping'],
-                                },
-                            },
-                        },
-                    ],
-                    'init_containers': sidecar_containers,
+                    'containers': containers,
+                    'init_containers': init_containers,
                     'volumes': sidecar_volumes,
                 },
             },
@@ -367,43 +576,31 @@ def create_application_sts(
         opts=k8s_opts,
     )
 
-    kubectl_args = p.Output.concat(
-        'exec statefulset/',
-        sts.metadata.name,
-        ' -c webserver -- '
-        'document_exporter ../export --delete --use-filename-format --use-folder-prefix --no-progress-bar',
-    )
 
-    k8s.batch.v1.CronJob(
-        'exporter',
-        metadata={'name': 'exporter'},
-        spec={
-            'schedule': component_config.paperless.exporter_schedule,
-            'successful_jobs_history_limit': 3,
-            'job_template': {
-                'spec': {
-                    'template': {
-                        'spec': {
-                            'containers': [
-                                {
-                                    'name': 'exporter',
-                                    'image': f'registry.k8s.io/kubectl:{component_config.paperless.exporter_kubectl_version}',
-                                    'args': kubectl_args.apply(lambda a: a.split(' ')),
-                                }
-                            ],
-                            'restart_policy': 'Never',
-                        }
-                    }
-                },
-            },
+def get_process_container(
+    image: str,
+    env_from: list[k8s.core.v1.EnvFromSourceArgsDict],
+    name: str,
+    command: list[str],
+    volume_mounts: list[k8s.core.v1.VolumeMountArgsDict],
+) -> k8s.core.v1.ContainerArgsDict:
+    """Container running a single paperless process, bypassing the image entrypoint."""
+    return {
+        'name': name,
+        'image': image,
+        'working_dir': '/usr/src/paperless/src',
+        'command': command,
+        # user of the paperless image, as the entrypoint switching users is skipped:
+        'security_context': {
+            'run_as_user': 1000,
+            'run_as_group': 1000,
         },
-        opts=k8s_opts,
-    )
-
-    return sts
+        'env_from': env_from,
+        'volume_mounts': volume_mounts,
+    }
 
 
-def create_service(fqdn, paperless_sts, k8s_opts):
+def create_service(fqdn, paperless_sts, middlewares_config, k8s_opts):
     service = k8s.core.v1.Service(
         'paperless',
         metadata={
@@ -423,30 +620,12 @@ def create_service(fqdn, paperless_sts, k8s_opts):
     )
 
     if fqdn:
-        k8s.apiextensions.CustomResource(
+        create_ingress_route(
             'ingress',
-            api_version='traefik.io/v1alpha1',
-            kind='IngressRoute',
-            metadata={
-                'name': 'ingress',
-            },
-            spec={
-                'entryPoints': ['websecure'],
-                'routes': [
-                    {
-                        'kind': 'Rule',
-                        'match': p.Output.concat('Host(`', fqdn, '`)'),
-                        'services': [
-                            {
-                                'name': service.metadata.name,
-                                'namespace': service.metadata.namespace,
-                                'port': 'http',
-                            },
-                        ],
-                    }
-                ],
-                # use default wildcard certificate:
-                'tls': {},
-            },
-            opts=k8s_opts,
+            hostname=fqdn,
+            service_name=service.metadata.name,
+            service_namespace=service.metadata.namespace,
+            service_port='http',
+            middlewares_config=middlewares_config,
+            k8s_opts=k8s_opts,
         )
@@ -0,0 +1,234 @@
+"""PostgreSQL database of paperless with optional PgBouncer connection pooling."""
+
+import pathlib
+
+import pulumi as p
+import pulumi_kubernetes as k8s
+import pulumi_random as random
+
+from paperless.model import ComponentConfig
+
+DB_NAME = 'paperless'
+DB_USER = 'paperless'
+DB_PORT = 5432
+POSTGRES_LABELS = {'app': 'postgres'}
+PGBOUNCER_LABELS = {'app': 'pgbouncer'}
+
+
+def create_database(
+    component_config: ComponentConfig,
+    k8s_opts: p.ResourceOptions,
+) -> tuple[dict[str, p.Input[str]], dict[str, p.Input[str]]]:
+    """Create the database and return the paperless configuration and secret values for it."""
+    postgres_config = component_config.postgres
+    assert postgres_config, 'only called if configured'
+
+    password = random.RandomPassword('postgres-password', length=64, special=False).result
+    secret = k8s.core.v1.Secret(
+        'postgres',
+        string_data={'password': password},
+        type='Opaque',
+        opts=k8s_opts,
+    )
+    password_env: k8s.core.v1.EnvVarSourceArgsDict = {
+        'secret_key_ref': {
+            'name': secret.metadata.name,
+            'key': 'password',
+        }
+    }
+
+    settings = {
+        'shared_buffers': postgres_config.shared_buffers,
+        'work_mem': postgres_config.work_mem,
+        'effective_cache_size': postgres_config.effective_cache_size,
+        'max_connections': str(postgres_config.max_connections),
+    }
+
+    k8s.apps.v1.StatefulSet(
+        'postgres',
+        metadata={'name': 'postgres'},
+        spec={
+            'replicas': 1,
+            'selector': {'match_labels': POSTGRES_LABELS},
+            'service_name': '',
+            'template': {
+                'metadata': {'labels': POSTGRES_LABELS},
+                'spec': {
+                    'containers': [
+                        {
+                            'name': 'postgres',
+                            'image': f'docker.io/library/postgres:{postgres_config.version}',
+                            'args': [
+                                arg
+                                for name, value in settings.items()
+                                for arg in ('-c', f'{name}={value}')
+                            ],
+                            'env': [
+                                {'name': 'POSTGRES_DB', 'value': DB_NAME},
+                                {'name': 'POSTGRES_USER', 'value': DB_USER},
+                                {'name': 'POSTGRES_PASSWORD', 'value_from': password_env},
+                                # initdb requires an empty directory, keep it below the volume root:
+                                {'name': 'PGDATA', 'value': '/var/lib/postgresql/data/pgdata'},
+                            ],
+                            'ports': [{'name': 'postgres', 'container_port': DB_PORT}],
+                            'volume_mounts': [
+                                {'name': 'data', 'mount_path': '/var/lib/postgresql/data'},
+                                {'name': 'shm', 'mount_path': '/dev/shm'},
+                            ],
+                            'readiness_probe': {
+                                'exec_': {
+                                    'command': ['pg_isready', '--username', DB_USER],
+                                },
+                            },
+                            'resources': postgres_config.resources.to_k8s(),
+                        },
+                    ],
+                    'volumes': [
+                        # the default of 64MB is too small for parallel queries:
+                        {'name': 'shm', 'empty_dir': {'medium': 'Memory'}},
+                    ],
+                },
+            },
+            'volume_claim_templates': [
+                {
+                    'metadata': {'name': 'data'},
+                    'spec': {
+                        'storage_class_name': 'data-hostpath-retained',
+                        'access_modes': ['ReadWriteOnce'],
+                        'resources': {'requests': {'storage': f'{postgres_config.size_gb}Gi'}},
+                    },
+                },
+            ],
+        },
+        opts=k8s_opts,
+    )
+
+    postgres_service = k8s.core.v1.Service(
+        'postgres',
+        metadata={'name': 'postgres'},
+        spec={
+            'selector': POSTGRES_LABELS,
+            'ports': [{'name': 'postgres', 'port': DB_PORT, 'target_port': 'postgres'}],
+        },
+        opts=k8s_opts,
+    )
+    db_host = postgres_service.metadata.name
+
+    if pgbouncer_config := postgres_config.pgbouncer:
+        k8s.apps.v1.Deployment(
+            'pgbouncer',
+            metadata={'name': 'pgbouncer'},
+            spec={
+                'replicas': 1,
+                'selector': {'match_labels': PGBOUNCER_LABELS},
+                'template': {
+                    'metadata': {'labels': PGBOUNCER_LABELS},
+                    'spec': {
+                        'containers': [
+                            {
+                                'name': 'pgbouncer',
+                                'image': f'docker.io/edoburu/pgbouncer:{pgbouncer_config.version}',
+                                'env': [
+                                    {'name': 'DB_HOST', 'value': db_host},
+                                    {'name': 'DB_PORT', 'value': str(DB_PORT)},
+                                    {'name': 'DB_NAME', 'value': DB_NAME},
+                                    {'name': 'DB_USER', 'value': DB_USER},
+                                    {'name': 'DB_PASSWORD', 'value_from': password_env},
+                                    {'name': 'LISTEN_PORT', 'value': str(DB_PORT)},
+                                    {'name': 'AUTH_TYPE', 'value': 'scram-sha-256'},
+                                    # transaction pooling breaks the server side cursors of
+                                    # Django:
+                                    {'name': 'POOL_MODE', 'value': 'session'},
+                                    {
+                                        'name': 'DEFAULT_POOL_SIZE',
+                                        'value': str(pgbouncer_config.default_pool_size),
+                                    },
+                                    {
+                                        'name': 'MAX_CLIENT_CONN',
+                                        'value': str(pgbouncer_config.max_client_conn),
+                                    },
+                                ],
+                                'ports': [{'name': 'postgres', 'container_port': DB_PORT}],
+                                'readiness_probe': {
+                                    'tcp_socket': {'port': 'postgres'},
+                                },
+                            },
+                        ],
+                    },
+                },
+            },
+            opts=k8s_opts,
+        )
+
+        pgbouncer_service = k8s.core.v1.Service(
+            'pgbouncer',
+            metadata={'name': 'pgbouncer'},
+            spec={
+                'selector': PGBOUNCER_LABELS,
+                'ports': [{'name': 'postgres', 'port': DB_PORT, 'target_port': 'postgres'}],
+            },
+            opts=k8s_opts,
+        )
+        db_host = pgbouncer_service.metadata.name
+
+    config_data: dict[str, p.Input[str]] = {
+        'PAPERLESS_DBENGINE': 'postgresql',
+        'PAPERLESS_DBHOST': db_host,
+        'PAPERLESS_DBPORT': str(DB_PORT),
+        'PAPERLESS_DBNAME': DB_NAME,
+        'PAPERLESS_DBUSER': DB_USER,
+    }
+    secret_data: dict[str, p.Input[str]] = {'PAPERLESS_DBPASS': password}
+    return config_data, secret_data
+
+
+def create_sqlite_migration(
+    component_config: ComponentConfig,
+    config: k8s.core.v1.ConfigMap,
+    config_secret: k8s.core.v1.Secret,
+    k8s_opts: p.ResourceOptions,
+) -> tuple[
+    list[k8s.core.v1.ContainerArgsDict],
+    list[k8s.core.v1.VolumeArgsDict],
+]:
+    """Import the SQLite database of the data volume, a no-op once it has been migrated.
+
+    Runs as init container of the paperless pod, so the SQLite database is not written to while it
+    is dumped and moved aside.
+    """
+    script_name = 'sqlite-to-postgres.sh'
+    script = k8s.core.v1.ConfigMap(
+        script_name,
+        data={script_name: pathlib.Path(f'assets/{script_name}').read_text()},
+        opts=k8s_opts,
+    )
+
+    volumes = [
+        k8s.core.v1.VolumeArgsDict(
+            name='sqlite-migration',
+            config_map={'name': script.metadata.name},
+        ),
+    ]
+
+    init_containers = [
+        k8s.core.v1.ContainerArgsDict(
+            name='sqlite-migration',
+            image=f'ghcr.io/paperless-ngx/paperless-ngx:{component_config.paperless.version}',
+            # user of the paperless image, owning the data volume:
+            security_context={
+                'run_as_user': 1000,
+                'run_as_group': 1000,
+            },
+            command=['/bin/sh', f'/scripts/{script_name}'],
+            env_from=[
+                {'config_map_ref': {'name': config.metadata.name}},
+                {'secret_ref': {'name': config_secret.metadata.name}},
+            ],
+            volume_mounts=[
+                {'name': 'data', 'mount_path': '/usr/src/paperless/data'},
+                {'name': 'sqlite-migration', 'mount_path': '/scripts', 'read_only': True},
+            ],
+        )
+    ]
+
+    return init_containers, volumes
@@ -0,0 +1,150 @@
+"""Celery task workers running separately from the paperless web server."""
+
+import pulumi as p
+import pulumi_kubernetes as k8s
+
+from paperless.consume import INBOX_CLAIM_NAME
+from paperless.media import get_media_volume_mounts
+from paperless.model import ComponentConfig
+
+WORKER_LABELS = {'app': 'paperless-worker'}
+
+
+def create_workers(
+    component_config: ComponentConfig,
+    config: k8s.core.v1.ConfigMap,
+    config_secret: k8s.core.v1.Secret,
+    broker: k8s.core.v1.Service,
+    paperless_sts: k8s.apps.v1.StatefulSet,
+    hot_media_volumes: list[k8s.core.v1.VolumeArgsDict],
+    k8s_opts: p.ResourceOptions,
+) -> k8s.apps.v1.Deployment:
+    workers_config = component_config.paperless.workers
+    assert workers_config, 'only called if configured'
+
+    # share the volumes of the single StatefulSet replica, the data volume is node local:
+    sts_name = paperless_sts.metadata.name
+    claim_names: dict[str, p.Input[str]] = {
+        volume: p.Output.format('{}-{}-0', volume, sts_name)
+        for volume in ('data', 'media', 'consume')
+    }
+    if component_config.paperless.consume.mode == 'inbox':
+        # consumed files are referenced by their path in the consume directory:
+        claim_names['consume'] = INBOX_CLAIM_NAME
+
+    volumes: list[k8s.core.v1.VolumeArgsDict] = [
+        {
+            'name': volume,
+            'persistent_volume_claim': {'claim_name': claim_name},
+        }
+        for volume, claim_name in claim_names.items()
+    ]
+    volumes.extend(hot_media_volumes)
+
+    deployment = k8s.apps.v1.Deployment(
+        'worker',
+        metadata={'name': 'paperless-worker'},
+        spec={
+            'replicas': workers_config.replicas,
+            'selector': {'match_labels': WORKER_LABELS},
+            'template': {
+                'metadata': {'labels': WORKER_LABELS},
+                'spec': {
+                    'affinity': {
+                        'pod_affinity': {
+                            'required_during_scheduling_ignored_during_execution': [
+                                {
+                                    'label_selector': {
+                                        'match_labels': paperless_sts.spec.selector.match_labels,
+                                    },
+                                    'topology_key': 'kubernetes.io/hostname',
+                                }
+                            ],
+                        },
+                    },
+                    # user of the paperless image, as the entrypoint switching users is skipped:
+                    'security_context': {
+                        'run_as_user': 1000,
+                        'run_as_group': 1000,
+                    },
+                    'containers': [
+                        {
+                            'name': 'worker',
+                            'image': f'ghcr.io/paperless-ngx/paperless-ngx:{component_config.paperless.version}',
+                            'working_dir': '/usr/src/paperless/src',
+                            'command': [
+                                'celery',
+                                '--app',
+                                'paperless',
+                                'worker',
+                                '--loglevel',
+                                'INFO',
+                                '--without-mingle',
+                                '--without-gossip',
+                            ],
+                            'volume_mounts': [
+                                {'name': 'data', 'mount_path': '/usr/src/paperless/data'},
+                                *get_media_volume_mounts(component_config),
+                                {'name': 'consume', 'mount_path': '/usr/src/paperless/consume'},
+                            ],
+                            'env_from': [
+                                {
+                                    'config_map_ref': {
+                                        'name': config.metadata.name,
+                                    }
+                                },
+                                {
+                                    'secret_ref': {
+                                        'name': config_secret.metadata.name,
+                                    }
+                                },
+                            ],
+                            'resources': component_config.paperless.performance.resources.to_k8s(),
+                        },
+                    ],
+                    'volumes': volumes,
+                },
+            },
+        },
+        opts=p.ResourceOptions.merge(
+            k8s_opts,
+            # replicas are owned by the autoscaler:
+            p.ResourceOptions(
+                ignore_changes=['spec.replicas'] if workers_config.autoscaling else []
+            ),
+        ),
+    )
+
+    if autoscaling := workers_config.autoscaling:
+        k8s.apiextensions.CustomResource(
+            'worker-scaler',
+            api_version='keda.sh/v1alpha1',
+            kind='ScaledObject',
+            metadata={'name': 'paperless-worker'},
+            spec={
+                'scaleTargetRef': {'name': deployment.metadata.name},
+                'minReplicaCount': autoscaling.min_replicas,
+                'maxReplicaCount': autoscaling.max_replicas,
+                'pollingInterval': autoscaling.polling_interval_sec,
+                'cooldownPeriod': autoscaling.cooldown_period_sec,
+                'triggers': [
+                    {
+                        'type': 'redis',
+                        'metadata': {
+                            'address': p.Output.format(
+                                '{}.{}:{}',
+                                broker.metadata.name,
+                                broker.metadata.namespace,
+                                component_config.redis.port,
+                            ),
+                            # default queue of the paperless Celery app:
+                            'listName': 'celery',
+                            'listLength': str(autoscaling.queue_length),
+                        },
+                    }
+                ],
+            },
+            opts=k8s_opts,
+        )
+
+    return deployment
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Write per-VM disk and network I/O counters for the node_exporter textfile collector.
+
+Usage: pve-guest-io-metrics <textfile collector directory>
+
+Disk counters come from the QEMU block statistics reported by the PVE API, packet counters from
+the tap devices of the guests. Tap devices count from the host side, their rx is the guest tx.
+"""
+
+import json
+import pathlib
+import socket
+import subprocess
+import sys
+
+DISK_METRICS = {
+    'rd_bytes': ('pve_guest_disk_read_bytes_total', 1),
+    'wr_bytes': ('pve_guest_disk_written_bytes_total', 1),
+    'rd_operations': ('pve_guest_disk_reads_completed_total', 1),
+    'wr_operations': ('pve_guest_disk_writes_completed_total', 1),
+    'flush_operations': ('pve_guest_disk_flushes_completed_total', 1),
+    'rd_total_time_ns': ('pve_guest_disk_read_time_seconds_total', 1e-9),
+    'wr_total_time_ns': ('pve_guest_disk_write_time_seconds_total', 1e-9),
+    'flush_total_time_ns': ('pve_guest_disk_flush_time_seconds_total', 1e-9),
+}
+
+NETWORK_METRICS = {
+    'tx_packets': 'pve_guest_network_receive_packets_total',
+    'rx_packets': 'pve_guest_network_transmit_packets_total',
+    'tx_dropped': 'pve_guest_network_receive_drop_total',
+    'rx_dropped': 'pve_guest_network_transmit_drop_total',
+}
+
+
+def pvesh(path: str):
+    return json.loads(
+        subprocess.run(
+            ['pvesh', 'get', path, '--output-format', 'json'],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    )
+
+
+def guest_metrics(node: str, vmid: int) -> list[str]:
+    labels = f'id="qemu/{vmid}"'
+    lines = []
+
+    status = pvesh(f'/nodes/{node}/qemu/{vmid}/status/current')
+    for drive, stats in sorted(status.get('blockstat', {}).items()):
+        for key, (name, factor) in DISK_METRICS.items():
+            if key in stats:
+                lines.append(f'{name}{{{labels},drive="{drive}"}} {stats[key] * factor}')
+
+    for interface in sorted(pathlib.Path('/sys/class/net').glob(f'tap{vmid}i*')):
+        for key, name in NETWORK_METRICS.items():
+            value = (interface / 'statistics' / key).read_text().strip()
+            lines.append(f'{name}{{{labels},interface="{interface.name}"}} {value}')
+
+    return lines
+
+
+def main() -> int:
+    textfile_path = pathlib.Path(sys.argv[1]) / 'pve-guest-io.prom'
+    node = socket.gethostname().split('.')[0]
+
+    try:
+        guests = [guest for guest in pvesh(f'/nodes/{node}/qemu') if guest['status'] == 'running']
+        lines = [line for guest in guests for line in guest_metrics(node, int(guest['vmid']))]
+        lines.append('pve_guest_io_metrics_up 1')
+    except (subprocess.CalledProcessError, json.JSONDecodeError, OSError) as e:
+        print(f'Failed to collect guest I/O metrics: {e}', file=sys.stderr)
+        lines = ['pve_guest_io_metrics_up 0']
+
+    # write atomically, the collector may read the file at any time:
+    tmp_path = textfile_path.with_suffix('.tmp')
+    tmp_path.write_text('\n'.join(lines) + '\n')
+    tmp_path.replace(textfile_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Write smbd metrics in Prometheus text format for the node_exporter textfile collector.
+
+Sessions, tree connects and open files are taken from `smbstatus --json`, request counts, latency
+and throughput from the smbd profiling counters (`smbd profiling level = on`).
+"""
+
+import collections
+import json
+import os
+import pathlib
+import re
+import subprocess
+import sys
+
+TEXTFILE_PATH = pathlib.Path('/var/lib/prometheus/node-exporter/smb.prom')
+
+# profiling counters of SMB2 requests, e.g. smb2_read_count, smb2_read_time, smb2_read_inbytes:
+PROFILE_PATTERN = re.compile(r'^smb2_(?P<op>\w+?)_(?P<kind>count|time|inbytes|outbytes):\s+(\d+)$')
+
+
+def smbstatus(*args: str) -> str:
+    return subprocess.run(
+        ['smbstatus', *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def status_metrics() -> list[str]:
+    status = json.loads(smbstatus('--json'))
+
+    sessions = collections.Counter(
+        session.get('session_dialect', 'unknown') for session in status.get('sessions', {}).values()
+    )
+    tcons = collections.Counter(tcon['service'] for tcon in status.get('tcons', {}).values())
+    open_files = collections.Counter(
+        os.path.basename(open_file['service_path'].rstrip('/'))
+        for open_file in status.get('open_files', {}).values()
+    )
+
+    return [
+        '# HELP samba_sessions Number of SMB sessions.',
+        '# TYPE samba_sessions gauge',
+        *(f'samba_sessions{{dialect="{d}"}} {n}' for d, n in sorted(sessions.items())),
+        '# HELP samba_share_connections Number of tree connects per share.',
+        '# TYPE samba_share_connections gauge',
+        *(f'samba_share_connections{{share="{s}"}} {n}' for s, n in sorted(tcons.items())),
+        '# HELP samba_share_open_files Number of open files per share.',
+        '# TYPE samba_share_open_files gauge',
+        *(f'samba_share_open_files{{share="{s}"}} {n}' for s, n in sorted(open_files.items())),
+    ]
+
+
+def profile_metrics() -> list[str]:
+    counters: dict[str, dict[str, int]] = collections.defaultdict(dict)
+    for line in smbstatus('--profile').splitlines():
+        if match := PROFILE_PATTERN.match(line.strip()):
+            counters[match['kind']][match['op']] = int(match[3])
+
+    return [
+        '# HELP samba_smb2_requests_total Number of SMB2 requests.',
+        '# TYPE samba_smb2_requests_total counter',
+        *(f'samba_smb2_requests_total{{op="{o}"}} {n}' for o, n in counters['count'].items()),
+        '# HELP samba_smb2_request_seconds_total Time spent processing SMB2 requests.',
+        '# TYPE samba_smb2_request_seconds_total counter',
+        *(
+            f'samba_smb2_request_seconds_total{{op="{o}"}} {n / 1e6}'
+            for o, n in counters['time'].items()
+        ),
+        '# HELP samba_smb2_received_bytes_total Bytes received with SMB2 requests.',
+        '# TYPE samba_smb2_received_bytes_total counter',
+        *(
+            f'samba_smb2_received_bytes_total{{op="{o}"}} {n}'
+            for o, n in counters['inbytes'].items()
+        ),
+        '# HELP samba_smb2_sent_bytes_total Bytes sent with SMB2 responses.',
+        '# TYPE samba_smb2_sent_bytes_total counter',
+        *(f'samba_smb2_sent_bytes_total{{op="{o}"}} {n}' for o, n in counters['outbytes'].items()),
+    ]
+
+
+def main() -> int:
+    try:
+        lines = [*status_metrics(), *profile_metrics(), 'samba_metrics_up 1']
+    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as e:
+        print(f'Failed to collect smbd metrics: {e}', file=sys.stderr)
+        lines = ['samba_metrics_up 0']
+
+    # write atomically, the collector may read the file at any time:
+    tmp_path = TEXTFILE_PATH.with_suffix('.tmp')
+    tmp_path.write_text('\n'.join(lines) + '\n')
+    tmp_path.replace(TEXTFILE_PATH)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
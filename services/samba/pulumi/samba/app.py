@@ -42,7 +42,14 @@ def create_server(component_config: ComponentConfig, proxmox_provider: proxmoxve
         datastore_id='local',
         content_type='snippets',
         source_raw={
-            'data': cloud_config_template.render(component_config.model_dump()),
+            'data': cloud_config_template.render(
+                component_config.model_dump()
+                | {
+                    'smb_metrics_script': pathlib.Path(
+                        'assets/smb-metrics/smb-metrics.py'
+                    ).read_text(),
+                }
+            ),
             'file_name': f'cloud-config-{component_config.vm.name}.yaml',
         },
         opts=p.ResourceOptions.merge(
@@ -52,6 +59,10 @@ def create_server(component_config: ComponentConfig, proxmox_provider: proxmoxve
     )
 
     p.export('smb-shares', (share.name for share in component_config.smb.shares))
+    p.export(
+        'smb-share-mount-options',
+        {share.name: share.client.mount_options() for share in component_config.smb.shares},
+    )
     p.export('smb-remote-username', component_config.smb.remote.username)
     p.export('smb-remote-password', p.Output.secret(component_config.smb.remote.password))
     p.export('smb-k8s-username', component_config.smb.k8s.username)
@@ -157,3 +168,24 @@ def create_server(component_config: ComponentConfig, proxmox_provider: proxmoxve
     )
 
     p.export('fqdn', dns_record.domain_name)
+
+    # scrape targets picked up by the observability stack, smbd metrics are served by node_exporter
+    # from its textfile collector:
+    if component_config.metrics.enabled:
+        p.export(
+            'scrape-targets',
+            [
+                {
+                    'name': f'{component_config.vm.name}_node_exporter',
+                    'job-name': 'node-exporter',
+                    'address': p.Output.concat(
+                        dns_record.domain_name, f':{component_config.metrics.node_exporter_port}'
+                    ),
+                    'labels': {
+                        'instance': component_config.vm.name,
+                        'role': 'samba',
+                        'source': 'samba',
+                    },
+                }
+            ],
+        )
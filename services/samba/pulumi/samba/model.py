@@ -1,10 +1,17 @@
 """Configuration model."""
 
 import ipaddress
+import typing as t
 
 import pydantic
 
-from utils.model import ConfigBaseModel, EnvVarRef, PulumiSecret, get_pulumi_project
+from utils.model import (
+    ConfigBaseModel,
+    EnvVarRef,
+    PulumiSecret,
+    TuningProfileConfig,
+    get_pulumi_project,
+)
 
 
 class ProxmoxConfig(ConfigBaseModel):
@@ -34,6 +41,7 @@ class VirtualMachineConfig(ConfigBaseModel):
     root_disk_size_gb: pydantic.PositiveInt
     data_disk_size_gb: pydantic.PositiveInt
     data_disk_mount: str = '/mnt/data'
+    tuning_profile: TuningProfileConfig = pydantic.Field(default_factory=TuningProfileConfig)
 
     ssh_user: str = 'ubuntu'
     ssh_public_key: str
@@ -45,10 +53,62 @@ class UnifyConfig(ConfigBaseModel):
     internal_domain: str = 'erx.box'
 
 
+# CIFS mount options recommended to clients of a share, unset values keep the kernel defaults:
+class SmbClientConfig(ConfigBaseModel):
+    protocol_version: str | None = None
+    cache: t.Literal['strict', 'loose', 'none', 'singleclient'] | None = None
+    actimeo: pydantic.NonNegativeInt | None = None
+    rsize: pydantic.PositiveInt | None = None
+    wsize: pydantic.PositiveInt | None = None
+    multichannel: bool = False
+    max_channels: pydantic.PositiveInt | None = None
+    nobrl: bool = False
+
+    def mount_options(self) -> list[str]:
+        options = []
+        if self.protocol_version:
+            options.append(f'vers={self.protocol_version}')
+        if self.cache:
+            options.append(f'cache={self.cache}')
+        if self.actimeo is not None:
+            options.append(f'actimeo={self.actimeo}')
+        if self.rsize:
+            options.append(f'rsize={self.rsize}')
+        if self.wsize:
+            options.append(f'wsize={self.wsize}')
+        if self.multichannel:
+            options.append('multichannel')
+        if self.max_channels:
+            options.append(f'max_channels={self.max_channels}')
+        if self.nobrl:
+            options.append('nobrl')
+        return options
+
+
+# smbd options which can be set globally and overridden per share, unset values keep the defaults:
+class SmbSharePerformanceConfig(ConfigBaseModel):
+    aio_read_size: pydantic.NonNegativeInt | None = None
+    aio_write_size: pydantic.NonNegativeInt | None = None
+    io_uring: bool | None = None
+    use_sendfile: bool | None = None
+    strict_sync: bool | None = None
+
+
+class SmbPerformanceConfig(SmbSharePerformanceConfig):
+    server_multi_channel_support: bool | None = None
+    socket_options: list[str] = pydantic.Field(default_factory=list)
+    # smbd only honours this in [global]:
+    min_receivefile_size: pydantic.NonNegativeInt | None = None
+
+
 class SmbShare(ConfigBaseModel):
     name: str
     remote_write: bool
     k8s_write: bool
+    client: SmbClientConfig = pydantic.Field(default_factory=SmbClientConfig)
+    performance: SmbSharePerformanceConfig = pydantic.Field(
+        default_factory=SmbSharePerformanceConfig
+    )
 
 
 class SmbAccount(ConfigBaseModel):
@@ -60,14 +120,22 @@ class SmbConfig(ConfigBaseModel):
     remote: SmbAccount
     k8s: SmbAccount
     group: str = 'smb-users'
+    performance: SmbPerformanceConfig = pydantic.Field(default_factory=SmbPerformanceConfig)
     shares: list[SmbShare]
 
 
+class MetricsConfig(ConfigBaseModel):
+    enabled: bool = True
+    node_exporter_port: pydantic.PositiveInt = 9100
+    smb_interval_sec: pydantic.PositiveInt = 30
+
+
 class ComponentConfig(ConfigBaseModel):
     proxmox: ProxmoxConfig
     vm: VirtualMachineConfig
     unify: UnifyConfig = pydantic.Field(default_factory=UnifyConfig)
     smb: SmbConfig
+    metrics: MetricsConfig = pydantic.Field(default_factory=MetricsConfig)
 
 
 class StackConfig(ConfigBaseModel):
@@ -1,7 +1,9 @@
 import os
 import pathlib
+import typing as t
 
 import pulumi as p
+import pulumi_kubernetes as k8s
 import pydantic
 import pydantic_core.core_schema as pyd_core_schema
 
@@ -66,3 +68,77 @@ class EnvVarRef(ConfigBaseModel):
 class CloudflareConfig(ConfigBaseModel):
     api_token: EnvVarRef
     zone: str = 'mpagel.de'
+
+
+class TuningProfileConfig(ConfigBaseModel):
+    """Kernel and host tuning rendered into the cloud-init configuration of a VM.
+
+    Unset values keep the distribution defaults.
+    """
+
+    sysctl: dict[str, int | str] = pydantic.Field(default_factory=dict)
+    """Kernel parameters written to a sysctl drop-in, e.g. `fs.inotify.max_user_watches`."""
+
+    transparent_hugepage: t.Literal['always', 'madvise', 'never'] | None = None
+    io_scheduler: t.Literal['none', 'mq-deadline', 'bfq', 'kyber'] | None = None
+    """I/O scheduler for the virtio block devices."""
+
+    cpu_governor: str | None = None
+    """CPU frequency governor, only effective if the VM exposes cpufreq."""
+
+    data_mount_options: list[str] = pydantic.Field(default_factory=list)
+    """Additional ext4 mount options for data disks, e.g. `noatime`, `lazytime`, `commit=30`."""
+
+
+class ResourcesConfig(ConfigBaseModel):
+    """Container resource requests and limits as Kubernetes quantities, e.g. `100m` or `256Mi`.
+
+    Unset values are omitted from the container spec.
+    """
+
+    cpu_request: str | None = None
+    memory_request: str | None = None
+    cpu_limit: str | None = None
+    memory_limit: str | None = None
+
+    def to_k8s(self) -> k8s.core.v1.ResourceRequirementsArgsDict:
+        """Resources in the shape of a Kubernetes container `resources` field."""
+        resources: k8s.core.v1.ResourceRequirementsArgsDict = {}
+        if requests := _quantities(cpu=self.cpu_request, memory=self.memory_request):
+            resources['requests'] = requests
+        if limits := _quantities(cpu=self.cpu_limit, memory=self.memory_limit):
+            resources['limits'] = limits
+        return resources
+
+    @property
+    def cpus(self) -> float | None:
+        """CPUs available to the container, the limit if set and the request otherwise."""
+        quantity = self.cpu_limit or self.cpu_request
+        if not quantity:
+            return None
+        if quantity.endswith('m'):
+            return int(quantity.removesuffix('m')) / 1000
+        return float(quantity)
+
+
+def _quantities(**quantities: str | None) -> dict[str, str]:
+    return {name: value for name, value in quantities.items() if value}
+
+
+class IngressMiddlewaresConfig(ConfigBaseModel):
+    """Traefik middlewares an IngressRoute opts in to, see `utils.traefik`."""
+
+    compress: bool = False
+    """Compress responses with zstd, brotli or gzip, depending on the client."""
+
+    static_path_prefixes: list[str] = pydantic.Field(default_factory=list)
+    """Path prefixes of static assets, e.g. `/static/`, routed with the static cache headers."""
+
+    static_cache_max_age_sec: pydantic.PositiveInt = 7 * 24 * 3600
+    """Lifetime of static assets in browser and intermediate caches."""
+
+    retry_attempts: pydantic.PositiveInt | None = None
+    """Retry requests on network errors towards the backend, e.g. during pod restarts."""
+
+    buffering_max_request_body_mb: pydantic.PositiveInt | None = None
+    """Buffer request bodies up to this size before forwarding, e.g. for slow upload clients."""